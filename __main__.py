@@ -25,4 +25,5 @@ from app import *
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,timestep=1.0/TICK_RATE,
+             retained=True,atlas=True).run()
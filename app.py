@@ -13,6 +13,9 @@ question on Piazza.
 from consts import *
 from game2d import *
 from wave import *
+from replay import Recorder
+import os
+import time
 
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
@@ -70,8 +73,15 @@ class Invaders(GameApp):
     # store any score across multiple waves). But you must document them.
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
 
-    #Attribute _lastEscape: the number of times escape was pressed last frame
-    #Invariant: _lastEscape is an int >= 0
+    # Attribute _recorder: the recorder of the input consumed by the current wave
+    # Invariant: _recorder is a Recorder object, or None if the game is not being
+    # recorded (there is no wave, the wave is complete, or there is no fixed timestep)
+    #
+    # Attribute _shown: the message and wave drawn in the last frame
+    # Invariant: _shown is a list of GLabel and Wave objects, possibly empty
+    #
+    # Attribute _preloader: the loader of the images, sounds and fonts of the game
+    # Invariant: _preloader is a Preloader object, or None once every asset is loaded
 
     # DO NOT MAKE A NEW INITIALIZER!
 
@@ -89,15 +99,22 @@ class Invaders(GameApp):
         given invariants. When done, it sets the _state to STATE_INACTIVE and
         create a message (in attribute _text) saying that the user should press
         to play a game.
+
+        It also starts loading the assets of the game in the background, so that
+        the first wave does not have to read anything from disk.  The message shows
+        the progress until they are loaded.
         """
         self._state = STATE_INACTIVE
         self._wave = None
+        self._text = None
 
-        self._text = GLabel(font_size = ARCADE_LARGE,
-                            font_name = ARCADE_FONT, x = (GAME_WIDTH/2),
-                            y = (GAME_HEIGHT/2), text ='Press ESC to Begin')
+        self._preloader = Preloader(voices = {'pew2.wav': SOUND_VOICES,
+                                              'pop1.wav': SOUND_VOICES})
+        self._preloader.start()
+        self._setMessage('Loading 0%')
 
-        self._lastEscape = False
+        self._recorder = None
+        self._shown = []
 
     def update(self,dt):
         """
@@ -120,7 +137,9 @@ class Invaders(GameApp):
         displays a simple message on the screen. The application remains in
         this state so long as the player never presses a key.  In addition,
         this is the state the application returns to when the game is over
-        (all lives are lost or all aliens are dead).
+        (all lives are lost or all aliens are dead).  While the assets are
+        still loading, the message shows the progress instead.  The player
+        may start anyway; anything not loaded yet is loaded when it is used.
 
         STATE_NEWWAVE: This is the state creates a new wave and shows it on
         the screen. The application switches to this state if the state was
@@ -147,10 +166,16 @@ class Invaders(GameApp):
         You are allowed to add more states if you wish. Should you do so, you should
         describe them here.
 
+        The game is started with a fixed timestep (see __main__.py), so this
+        method is called TICK_RATE times a second of game time, no matter the
+        frame rate, and dt is always 1/TICK_RATE.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
         self._determineState()
+        self._recordInput()
+        self._preload()
 
         if self._state == STATE_NEWWAVE:
             self._text == None
@@ -158,21 +183,15 @@ class Invaders(GameApp):
         elif self._state == STATE_ACTIVE:
             self._wave.update(self.input, dt)
         elif self._state == STATE_PAUSED:
-            self._text = GLabel(font_size = ARCADE_LARGE,
-                                    font_name = ARCADE_FONT, x = (GAME_WIDTH/2),
-                                    y = (GAME_HEIGHT/2), text ='Press ESC to Continue')
+            self._setMessage('Press ESC to Continue')
         elif self._state == STATE_CONTINUE:
             self._wave.createShip()
             self._state = STATE_ACTIVE
         elif self._state == STATE_COMPLETE:
             if self._wave.getOutcome() == "win":
-                self._text = GLabel(font_size = ARCADE_LARGE,
-                                        font_name = ARCADE_FONT, x = (GAME_WIDTH/2),
-                                        y = (GAME_HEIGHT/2), text ='You Win!')
+                self._setMessage('You Win!')
             elif self._wave.getOutcome() == "lose":
-                self._text = GLabel(font_size = ARCADE_LARGE,
-                                        font_name = ARCADE_FONT, x = (GAME_WIDTH/2),
-                                        y = (GAME_HEIGHT/2), text ='You Lose!')
+                self._setMessage('You Lose!')
 
     def draw(self):
         """
@@ -187,16 +206,33 @@ class Invaders(GameApp):
         getters for these attributes or you need to add a draw method to
         class Wave.  We suggest the latter.  See the example subcontroller.py
         from class.
+
+        The wave is drawn alpha of the way between the last two updates, so
+        that motion stays smooth when the frame rate does not match TICK_RATE.
+
+        The view is retained (see __main__.py), so it is not cleared between
+        frames.  Anything drawn in the last frame but not in this one (like the
+        message once the game is unpaused) has to be erased.
         """
+        shown = []
         if self._state == STATE_INACTIVE:
-            self._text.draw(self.view)
+            shown = [self._text]
         elif self._state == STATE_ACTIVE:
-            self._wave.draw(self.view)
+            self._wave.draw(self.view, self.alpha)
+            shown = [self._wave]
         elif self._state == STATE_PAUSED:
-            self._wave.draw(self.view)
-            self._text.draw(self.view)
+            self._wave.draw(self.view, self.alpha)
+            shown = [self._wave, self._text]
         elif self._state == STATE_COMPLETE:
+            shown = [self._text]
+
+        if self._text in shown:
             self._text.draw(self.view)
+        if self.view.retained:
+            for item in self._shown:
+                if not item in shown:
+                    item.erase(self.view)
+        self._shown = shown
 
     # HELPER METHODS FOR THE STATES GO HERE
     def _determineState(self):
@@ -209,17 +245,12 @@ class Invaders(GameApp):
         We do not want the state to continue to change as we hold down the key.  The
         user must release the key and press it again to change the state.
         """
-        #check if escape was just pressed
-        currentEscape = self.input.is_key_down('escape')
-
-        #change state if escape was just pressed and it wasn't pressed last frame
-        if currentEscape == True and self._lastEscape == False:
+        #change state if escape was pressed since the last update
+        if self.input.was_key_pressed('escape'):
             if self._state == STATE_INACTIVE:
                 self._state = STATE_NEWWAVE
             elif self._state == STATE_PAUSED:
                 self._state = STATE_CONTINUE
-             #store whether or not the escapebar was pressed in this frame inside of _lastEscape
-             #so this info can be used for next frame
         elif self._wave != None and self._wave.getShip() == None:
             if self._wave.getLives() > 0:
                 self._state = STATE_PAUSED
@@ -227,7 +258,39 @@ class Invaders(GameApp):
         elif self._wave != None and self._wave.getOutcome() != None:
             self._state = STATE_COMPLETE
 
-        self._lastEscape = currentEscape
+    def _preload(self):
+        """
+        Helper function that hands loaded assets to the game, a few each frame
+
+        In STATE_INACTIVE, the message shows the progress, and then tells the
+        player to begin once every asset is loaded.
+        """
+        if self._preloader is None:
+            return
+
+        done = self._preloader.update()
+        if self._state == STATE_INACTIVE:
+            if done:
+                self._setMessage('Press ESC to Begin')
+            else:
+                self._setMessage('Loading %d%%' % int(100*self._preloader.progress))
+        if done:
+            self._preloader = None
+
+    def _setMessage(self, text):
+        """
+        Helper function to show text as the message
+
+        A new label is only made when the text changes, so that the same
+        message is not made again in every update.
+
+        Parameter text: the text of the message
+        Precondition: text is a string
+        """
+        if self._text is None or self._text.text != text:
+            self._text = GLabel(font_size = ARCADE_LARGE,
+                                font_name = ARCADE_FONT, x = (GAME_WIDTH/2),
+                                y = (GAME_HEIGHT/2), text = text)
 
     def _createWave(self):
         """
@@ -235,3 +298,30 @@ class Invaders(GameApp):
         """
         self._wave = Wave()
         self._state = STATE_ACTIVE
+
+        if REPLAY_FOLDER is not None and self.timestep is not None:
+            self._recorder = Recorder(self._wave, self.timestep)
+
+    def _recordInput(self):
+        """
+        Records the input consumed in this update, and saves the recording
+        once the wave is complete
+
+        The recording is saved to REPLAY_FOLDER, named after the time and the
+        seed of the wave.  A game that cannot be saved is simply not recorded.
+        """
+        if self._recorder is None:
+            return
+
+        if self._state == STATE_COMPLETE:
+            folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), REPLAY_FOLDER)
+            name = 'replay-%s-%d.air' % (time.strftime('%Y%m%d-%H%M%S'), self._wave.getSeed())
+            try:
+                os.makedirs(folder, exist_ok=True)
+                self._recorder.replay().save(os.path.join(folder, name))
+            except OSError:
+                pass # The game is still playable without the recording
+            self._recorder = None
+        elif self._state != STATE_NEWWAVE:
+            self._recorder.record(self.input, updated=self._state == STATE_ACTIVE,
+                                  created=self._state == STATE_CONTINUE)
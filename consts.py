@@ -92,6 +92,19 @@ STATE_CONTINUE = 4
 #: state when the game is complete (won or lost)
 STATE_COMPLETE = 5
 
+# the number of (fixed) simulation updates per second of game time
+TICK_RATE = 60
+
+
+### AGENT CONSTANTS ###
+
+# the keys held down for each action an agent (bot) may take, by action number
+ACTION_KEYS = ((), ('left',), ('right',), ('spacebar',), ('left','spacebar'), ('right','spacebar'))
+# the outcome codes used when games are stored in arrays (none, win or lose)
+OUTCOME_NONE = 0
+OUTCOME_WIN  = 1
+OUTCOME_LOSE = -1
+
 
 ### USE COMMAND LINE ARGUMENTS TO CHANGE NUMBER OF ALIENS IN A ROW"""
 """
@@ -137,6 +150,8 @@ ALIEN_POINTS = 10
 SPEED_FACTOR = 1.03
 # The music volume for each alien step.
 STEP_VOLUME = 0.3
+# The number of copies (voices) of a sound that can overlap, like shots and alien explosions
+SOUND_VOICES = 4
 
 # The font choice for labels and messages
 ARCADE_FONT = 'Arcade.ttf'
@@ -166,3 +181,7 @@ LIVES_OFFSET  = 135
 BANNER_WIDTH  = GAME_WIDTH-100
 # The height of a message banner
 BANNER_HEIGHT = GAME_HEIGHT/4
+
+# The folder (next to this file) where finished games are recorded, or None for no recording.
+# Recording is off unless this is set (for example, to 'Replays')
+REPLAY_FOLDER = None
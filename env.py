@@ -0,0 +1,269 @@
+"""
+Reinforcement learning environment for Alien Invaders
+
+This module wraps a headless Wave in the reset/step/render interface used by
+most reinforcement learning libraries (the same one as OpenAI Gym).  The
+environment presses keys on a HeadlessInput and calls Wave.update, so the game
+is exactly the one played in Invaders, just without the window.
+
+Observations are either a feature vector (the default) or a small grayscale
+frame of the screen.  Both are NumPy arrays, and neither needs Kivy.
+"""
+from consts import *
+from headless import HeadlessInput
+from wave import Wave
+import math
+import numpy as np
+
+# The gray levels used in frames
+_BACKGROUND = 0
+_LINE   = 64
+_ALIEN  = 170
+_SHIP   = 255
+_PLAYER_BOLT = 255
+_ALIEN_BOLT  = 128
+
+
+class InvadersEnv(object):
+    """
+    A class representing a single game of Alien Invaders for an agent.
+
+    An action is an index into ACTION_KEYS in consts.py.  Each call to step
+    plays frameskip updates with that action, and returns the observation,
+    the points scored, whether the game is over and a dictionary of extra
+    information.  The spacebar is only held down for the first of these
+    updates, so that an agent that fires on every step fires as often as it
+    can (the ship only fires when the spacebar is first pressed).
+
+        env = InvadersEnv(frameskip=4)
+        obs = env.reset(seed=0)
+        done = False
+        while not done:
+            obs, reward, done, info = env.step(agent(obs))
+
+    As there is no player to unpause the game, a destroyed ship is replaced
+    at once.  A game that reaches the update limit is over, and info then has
+    'truncated' set to True.
+
+    With observation 'features', an observation has the same layout as a row
+    of WaveBatch.observe (with the same capacity): the ship x (as a fraction
+    of GAME_WIDTH, or -1 if there is no ship), the lives left, the center of
+    the top left alien cell, the player bolt (a flag and its position), the
+    alive flag of every alien, and then a flag and position for each alien
+    bolt, lowest first.
+    With observation 'frame', an observation is the result of render().
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the game being played
+    # Invariant: _wave is a Wave object, or None before the first reset
+    #
+    # Attribute _input: the synthetic keyboard for the wave
+    # Invariant: _input is a HeadlessInput object
+    #
+    # Attribute _observation: the kind of observation to return
+    # Invariant: _observation is 'features' or 'frame'
+    #
+    # Attribute _frameskip: the number of updates played by each step
+    # Invariant: _frameskip is an int > 0
+    #
+    # Attribute _scale: the number of pixels in each side of a frame pixel
+    # Invariant: _scale is an int > 0
+    #
+    # Attribute _capacity: the number of alien bolts in a feature vector
+    # Invariant: _capacity is an int >= 0
+    #
+    # Attribute _rows, _cols: the size of the alien grid
+    # Invariant: _rows, _cols are ints > 0
+    #
+    # Attribute _dt: the number of seconds in a single update
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _limit: the most updates in a game
+    # Invariant: _limit is None or an int > 0
+    #
+    # Attribute _ticks: the number of updates played in this game
+    # Invariant: _ticks is an int >= 0
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def action_count(self):
+        """
+        The number of actions (the size of ACTION_KEYS)
+        """
+        return len(ACTION_KEYS)
+
+    @property
+    def observation_shape(self):
+        """
+        The shape of every observation
+        """
+        if self._observation == 'frame':
+            return (math.ceil(GAME_HEIGHT/self._scale), math.ceil(GAME_WIDTH/self._scale))
+        return (7 + self._rows*self._cols + 3*self._capacity,)
+
+    # INITIALIZER
+    def __init__(self, observation='features', frameskip=4, scale=4, capacity=16,
+                 rows=ALIEN_ROWS, cols=ALIENS_IN_ROW, dt=1.0/TICK_RATE, limit=None):
+        """
+        Initializes the environment.  Call reset before the first step.
+
+        Parameter observation: the kind of observation, 'features' or 'frame'
+        Precondition: observation is one of those strings
+
+        Parameter frameskip: the number of updates played by each step
+        Precondition: frameskip is an int > 0
+
+        Parameter scale: the number of pixels in each side of a frame pixel
+        Precondition: scale is an int > 0
+
+        Parameter capacity: the number of alien bolts in a feature vector
+        Precondition: capacity is an int >= 0
+
+        Parameter rows, cols: the size of the alien grid
+        Precondition: rows, cols are ints > 0
+
+        Parameter dt: the number of seconds in a single update
+        Precondition: dt is a float > 0
+
+        Parameter limit: the most updates in a game, or None for no limit
+        Precondition: limit is None or an int > 0
+        """
+        assert observation in ('features', 'frame'), '%s is not an observation' % repr(observation)
+        self._observation = observation
+        self._frameskip = frameskip
+        self._scale = scale
+        self._capacity = capacity
+        self._rows = rows
+        self._cols = cols
+        self._dt = dt
+        self._limit = limit
+        self._wave = None
+        self._input = HeadlessInput()
+        self._ticks = 0
+
+    # PUBLIC METHODS
+    def reset(self, seed=None):
+        """
+        Returns the first observation of a new game
+
+        Parameter seed: the random seed of the game, or None to pick one at random
+        Precondition: seed is None or an int >= 0
+        """
+        self._wave = Wave(self._rows, self._cols, seed)
+        self._input.release()
+        self._ticks = 0
+        return self._observe()
+
+    def step(self, action):
+        """
+        Returns (observation, reward, done, info) after playing the action
+
+        Parameter action: the action to play
+        Precondition: action is an int, an index into ACTION_KEYS
+        """
+        assert self._wave is not None, 'the environment must be reset first'
+        keys = ACTION_KEYS[action]
+        held = tuple(key for key in keys if key != 'spacebar')
+
+        score = self._wave.getScore()
+        for tick in range(self._frameskip):
+            if self._wave.getOutcome() is not None or self._truncated():
+                break
+            if self._wave.getShip() is None:
+                self._wave.createShip()
+            self._input.press(*(keys if tick == 0 else held))
+            self._wave.update(self._input, self._dt)
+            self._ticks += 1
+
+        done = self._wave.getOutcome() is not None or self._truncated()
+        info = {'score': self._wave.getScore(), 'lives': self._wave.getLives(),
+                'ticks': self._ticks, 'outcome': self._wave.getOutcome(),
+                'truncated': self._wave.getOutcome() is None and self._truncated()}
+        return (self._observe(), self._wave.getScore()-score, done, info)
+
+    def render(self):
+        """
+        Returns a grayscale picture of the game as a 2d uint8 array
+
+        Row 0 of the array is the top of the screen.  Each pixel of the array
+        covers a square of scale by scale pixels of the game window.
+        """
+        shape = (math.ceil(GAME_HEIGHT/self._scale), math.ceil(GAME_WIDTH/self._scale))
+        frame = np.full(shape, _BACKGROUND, dtype=np.uint8)
+        if self._wave is None:
+            return frame
+
+        self._fill(frame, GAME_WIDTH/2, DEFENSE_LINE, GAME_WIDTH, 1, _LINE)
+
+        aliens = self._wave.getAliens()
+        for row, col in zip(*np.nonzero(aliens.alive)):
+            self._fill(frame, aliens.x[row, col], aliens.y[row, col],
+                       ALIEN_WIDTH, ALIEN_HEIGHT, _ALIEN)
+
+        ship = self._wave.getShip()
+        if ship is not None:
+            self._fill(frame, ship.x, ship.y, SHIP_WIDTH, SHIP_HEIGHT, _SHIP)
+
+        for bolt in self._wave.getBolts():
+            self._fill(frame, bolt.x, bolt.y, BOLT_WIDTH, BOLT_HEIGHT,
+                       _PLAYER_BOLT if bolt.isPlayerBolt() else _ALIEN_BOLT)
+        return frame
+
+    # HIDDEN METHODS
+    def _truncated(self):
+        """
+        Returns True if this game has reached the update limit
+        """
+        return self._limit is not None and self._ticks >= self._limit
+
+    def _observe(self):
+        """
+        Returns the observation of the current game
+        """
+        if self._observation == 'frame':
+            return self.render()
+
+        features = np.zeros(self.observation_shape, dtype=np.float32)
+        ship = self._wave.getShip()
+        features[0] = -1 if ship is None else ship.x/GAME_WIDTH
+        features[1] = self._wave.getLives()
+
+        aliens = self._wave.getAliens()
+        features[2] = aliens.x[0, 0]/GAME_WIDTH
+        features[3] = aliens.y[0, 0]/GAME_HEIGHT
+
+        bolts = self._wave.getBolts()
+        for bolt in bolts:
+            if bolt.isPlayerBolt():
+                features[4:7] = (1, bolt.x/GAME_WIDTH, bolt.y/GAME_HEIGHT)
+
+        end = 7 + self._rows*self._cols
+        features[7:end] = aliens.alive.ravel()
+
+        falling = sorted((bolt.y, bolt.x) for bolt in bolts if not bolt.isPlayerBolt())
+        for slot, (y, x) in enumerate(falling[:self._capacity]):
+            features[end+3*slot:end+3*slot+3] = (1, x/GAME_WIDTH, y/GAME_HEIGHT)
+        return features
+
+    def _fill(self, frame, x, y, width, height, value):
+        """
+        Fills the rectangle centered at (x,y) in frame with value
+
+        Parameter frame: the picture to draw in
+        Precondition: frame is a 2d uint8 array
+
+        Parameter x, y: the center of the rectangle in game coordinates
+        Precondition: x, y are numbers
+
+        Parameter width, height: the size of the rectangle in game pixels
+        Precondition: width, height are numbers > 0
+
+        Parameter value: the gray level of the rectangle
+        Precondition: value is an int 0..255
+        """
+        left = max(0, int((x-width/2)/self._scale))
+        right = min(frame.shape[1], math.ceil((x+width/2)/self._scale))
+        top = max(0, int((GAME_HEIGHT-(y+height/2))/self._scale))
+        bottom = min(frame.shape[0], math.ceil((GAME_HEIGHT-(y-height/2))/self._scale))
+        if left < right and top < bottom:
+            frame[top:bottom, left:right] = value
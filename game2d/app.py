@@ -41,6 +41,15 @@ class GameApp(kivy.app.App):
     """
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
+    # Class attribute for tracking filmstrip frames, keyed by (file name, format)
+    FRAME_CACHE = {}
+    # Class attribute for the atlas of the Images folder (None if there is no atlas)
+    ATLAS = None
+    # Class attribute for sounds opened ahead of time by a Preloader, keyed by file name
+    SOUND_CACHE = {}
+    
+    # The most (real) time a single frame may add to the fixed timestep accumulator
+    MAX_FRAME_TIME = 0.25
     
     
     # MUTABLE ATTRIBUTES
@@ -65,6 +74,48 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def timestep(self):
+        """
+        The fixed simulation timestep in seconds, or None for a variable timestep.
+        
+        If this value is None (the default), :meth:`update` is called once per animation
+        frame with the time since the last frame.  Otherwise, the time since the last
+        frame is added to an accumulator, and :meth:`update` is called once for every
+        whole timestep in the accumulator, always with this value as ``dt``.  The game
+        then runs at the same speed (and gives the same results) no matter how fast
+        the frames are drawn.  Any time left over is reported by :attr:`alpha`.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._timestep
+    
+    @timestep.setter
+    def timestep(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._timestep = value
+        self._accumulator = 0.0
+    
+    @property
+    def timescale(self):
+        """
+        The speed of simulated time relative to real time.
+        
+        This value only has an effect when :attr:`timestep` is not None.  A value of 4
+        will run four timesteps for every timestep of real time, which is a simple way
+        to fast-forward the game.  The default value is 1.
+        
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._timescale
+    
+    @timescale.setter
+    def timescale(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._timescale = value
+    
     
     # IMMUTABLE PROPERTIES
     @property
@@ -109,6 +160,23 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def alpha(self):
+        """
+        The fraction of a timestep left over after the last call to :meth:`update`.
+        
+        When :attr:`timestep` is not None, the simulation usually ends a frame part of
+        the way between two timesteps.  Drawing objects at ``alpha`` of the way from
+        their previous position to their current one gives smooth motion, even when
+        the frame rate and the timestep do not agree.  This value is always 1 when
+        the timestep is variable.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        if self._timestep is None:
+            return 1.0
+        return min(self._accumulator/self._timestep,1.0)
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -173,6 +241,9 @@ class GameApp(kivy.app.App):
         has already been loaded, it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
+        If the game has a texture atlas (see :meth:`load_atlas`) with this image, the
+        texture is the region of the atlas with the image, not a texture of its own.
+        
         This method will crash if name is not a valid file.
         
         :param name: The file name
@@ -182,6 +253,11 @@ class GameApp(kivy.app.App):
         if name in cls.TEXTURE_CACHE:
             return cls.TEXTURE_CACHE[name]
         
+        if cls.ATLAS is not None and name in cls.ATLAS:
+            texture = cls.ATLAS.region(name)
+            cls.TEXTURE_CACHE[name] = texture
+            return texture
+        
         try:
             from kivy.core.image import Image
             texture = Image(name).texture
@@ -191,6 +267,66 @@ class GameApp(kivy.app.App):
         
         return texture
     
+    @classmethod
+    def load_frames(cls,name,format):
+        """
+        Returns: The frames of the filmstrip for the given file name, or None if it cannot be loaded
+        
+        The ``name`` must refer to the file in the **Images** folder, and ``format`` is
+        the (rows, columns) grid of the filmstrip, as in :class:`GSprite`.  The result is
+        a tuple of texture regions, one per frame, arranged left-to-right, top-to-bottom.
+        
+        The frames are only cut once for each file and format, and shared by every sprite
+        that uses them.  They are removed from the cache when the texture is unloaded.
+        
+        :param name: The file name
+        :type name:  ``str``
+        
+        :param format: The grid size of the filmstrip
+        :type format:  2-element ``tuple`` of ``int`` > 0
+        """
+        key = (name,format)
+        if key in cls.FRAME_CACHE:
+            return cls.FRAME_CACHE[key]
+        
+        texture = cls.load_texture(name)
+        if texture is None:
+            return None
+        
+        rows, cols = format
+        width  = texture.width/cols
+        height = texture.height/rows
+        frames = []
+        for row in range(rows):
+            for col in range(cols):
+                frames.append(texture.get_region(int(col*width),texture.height-int(row*height)-int(height),
+                                                 int(width),int(height)))
+        frames = tuple(frames)
+        cls.FRAME_CACHE[key] = frames
+        return frames
+    
+    @classmethod
+    def load_atlas(cls):
+        """
+        Returns: The texture atlas of the **Images** folder, or None if it cannot be built
+        
+        The atlas packs every image in the **Images** folder into a single texture (see
+        :class:`TextureAtlas`).  Once it is built, :meth:`load_texture` returns regions
+        of the atlas instead of loading each image as its own texture.  Textures that 
+        were already loaded are not changed.  The atlas is only built once.
+        
+        This is called for you when the game starts if the keyword ``atlas`` is True.
+        The atlas needs Pillow; without it, this method returns None and every image
+        keeps its own texture.
+        """
+        if cls.ATLAS is None:
+            try:
+                from .atlas import TextureAtlas
+                cls.ATLAS = TextureAtlas(cls.images)
+            except (ImportError, OSError, ValueError) as e:
+                print('Failed to build the texture atlas:',e)
+        return cls.ATLAS
+    
     @classmethod
     def unload_texture(cls,name):
         """
@@ -198,12 +334,15 @@ class GameApp(kivy.app.App):
         
         The ``name`` should refer to the file in in the texture cache.  If the texture
         is in the cache, it will return the cached texture before removing it.  Otherwise, 
-        it will returning None.
+        it will returning None.  Any filmstrip frames cut from the texture (see 
+        :meth:`load_frames`) are removed as well.
         
         :param name: The file name
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
+        for key in [key for key in cls.FRAME_CACHE if key[0] == name]:
+            del cls.FRAME_CACHE[key]
         if name in cls.TEXTURE_CACHE:
             texture = cls.TEXTURE_CACHE[name]
             del cls.TEXTURE_CACHE[name]
@@ -211,6 +350,26 @@ class GameApp(kivy.app.App):
         
         return None
     
+    @classmethod
+    def load_sound(cls,name):
+        """
+        Returns: A Kivy sound for the given file name, or None if it cannot be loaded
+        
+        The ``name`` must refer to the file in the **Sounds** folder.  If a 
+        :class:`Preloader` has opened copies of this sound ahead of time, this method
+        returns one of them and removes it from the cache, since a Kivy sound can only
+        play once at a time.  Otherwise, it loads the sound from the file.
+        
+        :param name: The file name
+        :type name:  ``str``
+        """
+        assert cls.is_sound(name), '%s is not a sound file' % repr(name)
+        if cls.SOUND_CACHE.get(name):
+            return cls.SOUND_CACHE[name].pop()
+        
+        from kivy.core.audio import SoundLoader
+        return SoundLoader.load(name)
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -235,6 +394,12 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        self.timestep  = keywords.pop('timestep', None)
+        self.timescale = keywords.pop('timescale', 1)
+        self._retained = keywords.pop('retained', False)
+        self._atlas = keywords.pop('atlas', False)
+        assert type(self._retained) == bool, 'retained %s is not a bool' % repr(self._retained)
+        assert type(self._atlas) == bool, 'atlas %s is not a bool' % repr(self._atlas)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -264,6 +429,7 @@ class GameApp(kivy.app.App):
         from .gview import GInput, GView
         self._view = GView()
         self._view.size_hint = (1,1)
+        self._view.retained = self._retained
         self._input = GInput()
         self._input._register(self._view)
         return self.view
@@ -313,6 +479,9 @@ class GameApp(kivy.app.App):
         that represent the current animation state, so that they can persist across
         animation frames.  These attributes should be initialized in `start`.
         
+        If :attr:`timestep` is not None, this method is called once per timestep instead
+        of once per frame, and ``dt`` is always equal to the timestep.
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
@@ -340,6 +509,8 @@ class GameApp(kivy.app.App):
             Clock.schedule_interval(self._refresh,1.0/self.fps)
         else:
             Clock.schedule_interval(self._refresh,0)
+        if self._atlas:
+            self.load_atlas()
         self.start()
     
     def _refresh(self,dt):
@@ -349,11 +520,25 @@ class GameApp(kivy.app.App):
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
         
+        If :attr:`timestep` is not None, this calls `update` zero or more times with a
+        fixed ``dt``.  No more than ``MAX_FRAME_TIME`` seconds of real time are
+        simulated in a single frame, so a slow frame cannot cause a spiral of ever
+        longer frames.
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
-        self.view.clear()
-        self.update(dt)
+        if not self.view.retained:
+            self.view.clear()
+        if self._timestep is None:
+            self._input._advance()
+            self.update(dt)
+        else:
+            self._accumulator += min(dt,self.MAX_FRAME_TIME)*self._timescale
+            while self._accumulator >= self._timestep:
+                self._input._advance()
+                self.update(self._timestep)
+                self._accumulator -= self._timestep
         self.draw()
     
     def _setpaths(self):
@@ -0,0 +1,205 @@
+"""
+A module to pack many small images into a single texture.
+
+Every image file loaded by :class:`GImage` or :class:`GSprite` is normally its own
+texture.  Drawing a sprite from a different texture than the last one forces the
+graphics card to switch textures, and sprites from different textures cannot share a
+mesh.  A texture atlas packs all of the images in a folder into one large texture,
+and remembers the rectangle (the region) of each image in it.
+
+The atlas is built in memory when the game starts (see the ``atlas`` keyword of
+:class:`GameApp`).  Once it is built, :meth:`GameApp.load_texture` returns the region
+of the atlas for any image in it, so the drawing classes use the atlas without any
+change.  Building an atlas needs the Python Imaging Library (Pillow).  If it is not
+installed, each image is simply loaded as its own texture, as before.
+"""
+import os
+import os.path
+
+# The file extensions of the images that are packed
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+
+# #mark -
+class TextureAtlas(object):
+    """
+    A class representing the images of a folder packed into one texture.
+
+    Images are packed in rows (shelves), tallest first, with ``padding`` transparent
+    pixels around each one so that neighboring images do not bleed into each other when
+    they are scaled.  The atlas is as close to square as it can be, and both of its
+    sides are powers of two.  Images with a side larger than ``limit`` (like a
+    background) are not packed, since they would waste most of the atlas.
+
+    A region is the rectangle of an image in the atlas, with the origin at the bottom
+    left (as in the rest of Kivy).  The region of an image is a Kivy texture that can
+    be used anywhere the texture of the image file could be, including to cut out the
+    frames of a filmstrip with ``get_region``.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def texture(self):
+        """
+        The Kivy texture with every packed image.
+
+        **Invariant**: Must be a Kivy ``Texture``
+        """
+        return self._texture
+
+    @property
+    def size(self):
+        """
+        The size of the atlas texture as a (width, height) tuple.
+
+        **Invariant**: Must be a tuple of two ints, each a power of two
+        """
+        return self._size
+
+    @property
+    def names(self):
+        """
+        The file names of the packed images, in sorted order.
+
+        **Invariant**: Must be a tuple of strings
+        """
+        return tuple(sorted(self._regions))
+
+
+    # BUILT-IN METHODS
+    def __init__(self, folder, padding=2, limit=512, maxsize=4096):
+        """
+        Creates a new atlas from the images in a folder.
+
+        This constructor raises an ``ImportError`` if Pillow is not installed, an
+        ``OSError`` if an image cannot be read, and a ``ValueError`` if the images
+        do not fit in an atlas of ``maxsize`` by ``maxsize`` pixels.  It must be called
+        after the game window is open, since it makes a texture.
+
+        :param folder: the folder of images to pack
+        :type folder:  ``str``, naming a folder that exists
+
+        :param padding: the number of transparent pixels around each image
+        :type padding:  ``int`` >= 0
+
+        :param limit: the largest side of an image that is packed
+        :type limit:  ``int`` > 0
+
+        :param maxsize: the largest side of the atlas
+        :type maxsize:  ``int`` > 0, a power of two
+        """
+        from PIL import Image
+        from kivy.graphics.texture import Texture
+
+        images = {}
+        for name in sorted(os.listdir(folder)):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                image = Image.open(os.path.join(folder,name)).convert('RGBA')
+                if image.width <= limit and image.height <= limit:
+                    images[name] = image
+
+        names = list(images)
+        sizes = [images[name].size for name in names]
+        width, height, places = pack(sizes,padding,maxsize)
+
+        sheet = Image.new('RGBA',(width,height),(0,0,0,0))
+        self._regions = {}
+        for name, (w, h), (x, y) in zip(names,sizes,places):
+            sheet.paste(images[name],(x,y))
+            # Kivy measures from the bottom, Pillow from the top
+            self._regions[name] = (x, height-y-h, w, h)
+
+        self._size = (width, height)
+        self._texture = Texture.create(size=self._size, colorfmt='rgba')
+        self._texture.blit_buffer(sheet.tobytes(), colorfmt='rgba', bufferfmt='ubyte')
+        self._texture.flip_vertical()
+        self._cache = {}
+
+    def __contains__(self, name):
+        """
+        Returns True if the image ``name`` is packed in this atlas.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        return name in self._regions
+
+    def __repr__(self):
+        """
+        Returns an unambiguous representation of this atlas.
+        """
+        return '<%s %dx%d with %d images>' % (self.__class__.__name__,self._size[0],
+                                             self._size[1],len(self._regions))
+
+
+    # PUBLIC METHODS
+    def region(self, name):
+        """
+        Returns the region of the atlas with the image ``name``
+
+        The region is a Kivy texture, and it is only made once for each image.  This
+        method raises a ``KeyError`` if the image is not in this atlas.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if not name in self._cache:
+            self._cache[name] = self._texture.get_region(*self._regions[name])
+        return self._cache[name]
+
+
+# #mark -
+def pack(sizes, padding=2, maxsize=4096):
+    """
+    Returns (width, height, places) for a shelf packing of rectangles
+
+    The value ``places`` is a list with the (x, y) position of the top left corner of
+    each rectangle, in the order given, measured from the top left of the atlas.  The
+    width and height are powers of two.  The rectangles are packed tallest first,
+    left to right, starting a new shelf whenever the current one is full.  The width
+    starts as the smallest power of two whose square could hold every rectangle, and is
+    doubled until the shelves are no taller than it is wide.
+
+    This function raises a ``ValueError`` if the rectangles do not fit in a square
+    with side ``maxsize``.
+
+    :param sizes: the (width, height) of each rectangle
+    :type sizes:  ``list`` of pairs of ``int`` > 0
+
+    :param padding: the space around each rectangle
+    :type padding:  ``int`` >= 0
+
+    :param maxsize: the largest side of the atlas
+    :type maxsize:  ``int`` > 0, a power of two
+    """
+    if len(sizes) == 0:
+        return (1, 1, [])
+
+    padded = [(w+2*padding, h+2*padding) for (w, h) in sizes]
+    order  = sorted(range(len(sizes)), key=lambda i: (-padded[i][1], -padded[i][0], i))
+    area   = sum(w*h for (w, h) in padded)
+
+    width = 1
+    while width*width < area or width < max(w for (w, h) in padded):
+        width *= 2
+
+    while width <= maxsize:
+        places = [None]*len(sizes)
+        x = y = shelf = 0
+        for i in order:
+            w, h = padded[i]
+            if x+w > width:
+                x, y, shelf = 0, y+shelf, 0
+            places[i] = (x+padding, y+padding)
+            x += w
+            shelf = max(shelf, h)
+
+        used = y+shelf
+        if used <= width:
+            height = 1
+            while height < used:
+                height *= 2
+            return (width, height, places)
+        width *= 2
+
+    raise ValueError('the images do not fit in a %dx%d atlas' % (maxsize, maxsize))
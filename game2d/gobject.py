@@ -89,6 +89,10 @@ class GObject(object):
     You should never make a `GObject` directly.  Instead, you should use one of the
     subclasses: :class:`GRectangle`, :class:`GEllipse`, :class:`GImage`, :class:`GLabel`,
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
+
+    Most objects are only ever moved.  So an object starts with just a ``Translate``
+    instruction, and only gets ``Rotate`` and ``Scale`` instructions the first time
+    that the ``angle`` or ``scale`` is set to something other than the default.
     """
 
     # MUTABLE PROPERTIES
@@ -106,6 +110,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._bbox = None
 
     @property
     def y(self):
@@ -121,6 +126,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._bbox = None
 
     @property
     def width(self):
@@ -175,6 +181,8 @@ class GObject(object):
 
         **invariant**: Value must be either a number (``int`` or ``float``) or a pair of numbers.
         """
+        if self._scale is None:
+            return (1.0,1.0)
         return (self._scale.x,self._scale.y)
 
     @scale.setter
@@ -183,12 +191,16 @@ class GObject(object):
         assert type(value) in [int,float] or is_num_tuple(value,2), \
                 '%s is not a valid scaling factor' % repr(value)
         if type(value) in [int,float]:
-            self._scale.x = float(value)
-            self._scale.y = float(value)
-        else:
-            self._scale.x = float(value[0])
-            self._scale.y = float(value[1])
+            value = (value,value)
+        if self._scale is None:
+            if value[0] == 1 and value[1] == 1:
+                return
+            self._scale = Scale(1,1,1)
+            self._upgrade(self._scale)
+        self._scale.x = float(value[0])
+        self._scale.y = float(value[1])
         self._mtrue = False
+        self._bbox = None
 
     @property
     def angle(self):
@@ -199,16 +211,24 @@ class GObject(object):
 
         **invariant**: Value must be an ``int`` or ``float``
         """
+        if self._rotate is None:
+            return 0.0
         return self._rotate.angle
 
     @angle.setter
     def angle(self,value):
         import numpy as np
         assert type(value) in [int,float], '%s is not a number' % repr(value)
+        if self._rotate is None:
+            if value == 0:
+                return
+            self._rotate = Rotate(angle=0,axis=(0,0,1))
+            self._upgrade(self._rotate)
         diff = np.allclose([self._rotate.angle],[value])
         self._rotate.angle = float(value)
         if not diff:
             self._mtrue = False
+            self._bbox = None
 
     @property
     def linecolor(self):
@@ -309,24 +329,17 @@ class GObject(object):
         """
         The left edge of this shape.
 
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         ``x-width/2``.  Otherwise, it is the left-most value of the bounding box.
 
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.x-self.width/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self._getBBox()[0]
 
     @left.setter
     def left(self,value):
@@ -339,24 +352,17 @@ class GObject(object):
         """
         The right edge of this shape.
 
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         ``x+width/2``.  Otherwise, it is the right-most value of the bounding box.
 
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.x+self.width/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self._getBBox()[1]
 
     @right.setter
     def right(self,value):
@@ -369,24 +375,17 @@ class GObject(object):
         """
         The vertical coordinate of the top edge.
 
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         ``y+height/2``.  Otherwise, it is the top-most value of the bounding box.
 
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.y+self.height/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self._getBBox()[3]
 
     @top.setter
     def top(self,value):
@@ -400,24 +399,17 @@ class GObject(object):
         The vertical coordinate of the bottom edge.
 
 
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         ``y-height/2``.  Otherwise, it is the bottom-most value of the bounding box.
 
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.y-self.height/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self._getBBox()[2]
 
 
     @bottom.setter
@@ -481,10 +473,11 @@ class GObject(object):
         # Set the properties.
         self._defined = False
 
-        # Create the Kivy transforms for position and size
+        # Create the Kivy transforms for position (rotation and scale are made as needed)
         self._trans  = Translate(0,0,0)
-        self._rotate = Rotate(angle=0,axis=(0,0,1))
-        self._scale  = Scale(1,1,1)
+        self._rotate = None
+        self._scale  = None
+        self._bbox   = None
 
         # Now update these with the keywords; size first
         try:
@@ -559,7 +552,7 @@ class GObject(object):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
 
-        if self._rotate.angle != 0.0:
+        if self.angle != 0.0:
             point = self.matrix.inverse()._transform(point[0],point[1])
 
         return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
@@ -600,28 +593,95 @@ class GObject(object):
         except:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
+    def erase(self, view):
+        """
+        Removes this shape from the provided view.
+
+        This is only needed when the view is retained (see :attr:`GView.retained`).
+        Otherwise the view is cleared at the start of every frame anyway.
+
+        :param view: view to remove this shape from
+        :type view:  :class:`GView`
+        """
+        view.remove(self._cache)
+
     # HIDDEN METHODS
     def _reset(self):
         """
         Resets the drawing cache.
+
+        The cache is refilled, not replaced, so a shape that is already in a retained
+        view stays there (with its new contents) after a change like a new size.
         """
-        self._cache = InstructionGroup()
+        if getattr(self,'_cache',None) is None:
+            self._cache = InstructionGroup()
+        else:
+            self._cache.clear()
+        self._mtrue = False
+        self._bbox = None
         self._cache.add(PushMatrix())
         self._cache.add(self._trans)
-        self._cache.add(self._rotate)
-        self._cache.add(self._scale)
+        if not self._rotate is None:
+            self._cache.add(self._rotate)
+        if not self._scale is None:
+            self._cache.add(self._scale)
+
+    def _upgrade(self,instruction):
+        """
+        Adds a new rotation or scale instruction to the drawing cache.
+
+        The instruction goes after the translation (and after the rotation, for a scale),
+        so the shape is transformed just as if it always had the instruction.  If there
+        is no cache yet, :meth:`_reset` will add the instruction when it makes one.
+
+        :param instruction: the new transform
+        :type instruction:  ``Rotate`` or ``Scale``
+        """
+        if getattr(self,'_cache',None) is None:
+            return
+        index = 2
+        if instruction is self._scale and not self._rotate is None:
+            index = 3
+        self._cache.insert(index,instruction)
+
+    def _getBBox(self):
+        """
+        Returns the bounding box of this shape as a tuple (left, right, bottom, top).
+
+        The box is cached until the shape is moved, resized, rotated or scaled.  For a
+        shape that is not rotated, it is computed directly from the position, size and
+        scale.  Otherwise, it is the box around the four corners, scaled and then rotated
+        about the center (the same order as the Kivy instructions).
+        """
+        if self._bbox is None:
+            sx, sy = self.scale
+            dx = abs(sx)*self.width/2.0
+            dy = abs(sy)*self.height/2.0
+            if self.angle == 0.0:
+                self._bbox = (self.x-dx, self.x+dx, self.y-dy, self.y+dy)
+            else:
+                import math
+                radians = math.radians(self.angle)
+                cos = abs(math.cos(radians))
+                sin = abs(math.sin(radians))
+                # The half-size of the box around a rotated rectangle
+                hx = dx*cos+dy*sin
+                hy = dx*sin+dy*cos
+                self._bbox = (self.x-hx, self.x+hx, self.y-hy, self.y+hy)
+        return self._bbox
 
     def _build_matrix(self):
         """
         Builds the transform matrices after a settings change.
         """
+        sx, sy = self.scale
         self._matrix = Matrix()
         self._matrix.translate(self._trans.x,self._trans.y)
-        self._matrix.rotate(self._rotate.angle)
-        self._matrix.scale(self._scale.x,self._scale.y)
+        self._matrix.rotate(self.angle)
+        self._matrix.scale(sx,sy)
         self._invrse = Matrix()
-        self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
-        self._invrse.rotate(-self._rotate.angle)
+        self._invrse.scale(1.0/sx,1.0/sy)
+        self._invrse.rotate(-self.angle)
         self._invrse.translate(-self._trans.x,-self._trans.y)
         self._mtrue = True
 
@@ -10,8 +10,11 @@ Date:   August 1, 2017 (Python 3 version)
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
-from kivy.uix.label import Label
 from kivy.uix.image import Image
+from kivy.core.text import Label as CoreLabel, DEFAULT_FONT
+from kivy.core.text.markup import MarkupLabel
+from kivy.metrics import sp
+from collections import OrderedDict
 from .gobject import GObject
 from .app import GameApp
 
@@ -150,7 +153,7 @@ class GEllipse(GRectangle):
         
         rx = self.width/2.0
         ry = self.height/2.0
-        if self._rotate.angle == 0.0:
+        if self.angle == 0.0:
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
@@ -296,7 +299,31 @@ class GLabel(GRectangle):
     to the font by filename, including the .ttf. If you give no name, it will use the 
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
-    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
+    
+    The other text keywords of a Kivy label (listed in ``TEXT_KEYWORDS``, such as 
+    `italic`, `markup`, `line_height` or `outline_width`) can also be given to the 
+    constructor.  They are passed on to the text renderer, and cannot be changed once
+    the label is made.
+    
+    The text is rendered to a texture, and the textures of the most recently used texts
+    are kept in the class attribute ``TEXT_CACHE``.  Labels with the same text, font,
+    size, boldness, alignment and text keywords share the texture, so making the same
+    label again (or changing a label back to an earlier text) does not render the text
+    again.  The text color is applied when the texture is drawn, so it does not need a
+    texture of its own."""
+    
+    # Class attribute for tracking text textures, keyed by (text, font, size, bold, halign, options)
+    TEXT_CACHE = OrderedDict()
+    # The most textures kept in TEXT_CACHE (the least recently used are dropped)
+    TEXT_CACHE_SIZE = 64
+    # The keywords passed on to the Kivy text renderer (besides the text properties above)
+    TEXT_KEYWORDS = ('italic','underline','strikethrough','markup','line_height',
+                     'outline_width','outline_color','padding','padding_x','padding_y',
+                     'text_size','max_lines','shorten','shorten_from','split_str','strip',
+                     'font_hinting','font_kerning','font_blended','font_family',
+                     'font_context','font_features','base_direction','text_language',
+                     'unicode_errors')
     
     # MUTABLE PROPERTIES
     @property
@@ -311,8 +338,8 @@ class GLabel(GRectangle):
     def font_size(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._fsize = value
-        self._label.font_size = value
-        self._label.texture_update()
+        if self._defined:
+            self._reset()
     
     @property
     def font_name(self):
@@ -320,14 +347,15 @@ class GLabel(GRectangle):
         The file name for the .ttf file to use as a font
         
         **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._fname
     
     @font_name.setter
     def font_name(self,value):
         from .app import GameApp
         assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
-        self._label.font_name = value
-        self._label.texture_update()
+        self._fname = value
+        if self._defined:
+            self._reset()
     
     @property
     def bold(self):
@@ -339,13 +367,14 @@ class GLabel(GRectangle):
         `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
         
         **Invariant**: Must be a boolean"""
-        return self._label.bold
+        return self._bold
 
     @bold.setter
     def bold(self,value):
         assert type(value) == bool, repr(value)+' is not a bool'
-        self._label.bold = value
-        self._label.texture_update()
+        self._bold = value
+        if self._defined:
+            self._reset()
 
     @property
     def text(self):
@@ -357,13 +386,14 @@ class GLabel(GRectangle):
         this label will grow to ensure that the text will fit in the rectangle.
         
         **Invariant**: Must be a string"""
-        return self._label.text
+        return self._text
     
     @text.setter
     def text(self,value):
         assert type(value) == str, 'value %s is not a string' % repr(value)
-        self._label.text = value
-        self._label.texture_update()
+        self._text = value
+        if self._defined:
+            self._reset()
     
     @property
     def halign(self):
@@ -385,7 +415,6 @@ class GLabel(GRectangle):
     def halign(self,value):
         assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
         self._halign = value
-        self._label.halign = value
         if self._defined:
             self._reset()
     
@@ -409,7 +438,6 @@ class GLabel(GRectangle):
     def valign(self,value):
         assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % repr(value)
         self._valign = value
-        self._label.valign = value
         if self._defined:
             self._reset()
     
@@ -428,6 +456,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._bbox = None
         self._hanchor = 'center'
         self._ha = value
     
@@ -444,6 +473,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._bbox = None
         self._vanchor = 'center'
         self._hv = value
     
@@ -452,24 +482,17 @@ class GLabel(GRectangle):
         """
         The left edge of this shape.
         
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         `x-width/2`.  Otherwise, it is the left-most value of the bounding box.
         
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
         
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.x-self.width/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self._getBBox()[0]
     
     @left.setter
     def left(self,value):
@@ -484,24 +507,17 @@ class GLabel(GRectangle):
         """
         The right edge of this shape.
         
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         `x+width/2`.  Otherwise, it is the right-most value of the bounding box.
         
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
         
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.x+self.width/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self._getBBox()[1]
     
     @right.setter
     def right(self,value):
@@ -516,24 +532,17 @@ class GLabel(GRectangle):
         """
         The vertical coordinate of the top edge.
         
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         `y+height/2`.  Otherwise, it is the top-most value of the bounding box.
         
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
         
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.y+self.height/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self._getBBox()[3]
     
     @top.setter
     def top(self,value):
@@ -548,23 +557,16 @@ class GLabel(GRectangle):
         """
         The vertical coordinate of the bottom edge.
         
-        The value depends on the current angle of rotation. If rotation is 0, it is
+        The value depends on the current rotation and scale. If neither is changed, it is
         `y-height/2`.  Otherwise, it is the bottom-most value of the bounding box.
         
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The value is cached until the object is moved, resized, rotated or scaled.
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.y-self.height/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self._getBBox()[2]
     
     
     @bottom.setter
@@ -588,20 +590,27 @@ class GLabel(GRectangle):
             GLabel(text='Hello')
         
         This class supports the all same keywords as :class:`GRectangle`, as well as 
-        additional attributes for the text properties (e.g. font size and name).
+        additional attributes for the text properties (e.g. font size and name) and
+        the keywords in ``TEXT_KEYWORDS``.
         """
         self._defined = False
         self._hanchor = 'center'
         self._vanchor = 'center'
         
-        sanitized = {}
-        excludes  = ['linewidth','linecolor','fillcolor','halign','valign','left','bottom']
-        for key in keywords:
-            if not key in excludes:
-                sanitized[key] = keywords[key]
-        
-        self._label = Label(**sanitized)
-        self._label.size_hint = (None,None)
+        # The text keywords, as a sorted tuple of pairs so that they can be a cache key
+        options = []
+        for key in GLabel.TEXT_KEYWORDS:
+            if key in keywords:
+                value = keywords[key]
+                options.append((key,tuple(value) if type(value) == list else value))
+        self._options = tuple(options)
+        
+        self._fname = DEFAULT_FONT
+        if 'font_name' in keywords:
+            self.font_name = keywords['font_name']
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else sp(15)
+        self.bold = keywords['bold'] if 'bold' in keywords else False
+        self.text = keywords['text'] if 'text' in keywords else ''
         
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.halign = keywords['halign'] if 'halign' in keywords else 'center'
@@ -612,7 +621,6 @@ class GLabel(GRectangle):
             self.linecolor = (0,0,0,1)
         self._reset()
         self._defined = True
-        self._label.bind(texture_size=self._callback)
     
     def __str__(self):
         """
@@ -627,27 +635,65 @@ class GLabel(GRectangle):
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
     # HIDDEN METHODS
-    def _callback(self,instance=None,value=None):
+    @classmethod
+    def _render(cls,text,font_name,font_size,bold,halign='center',options=()):
         """
-        A workaround to deal with parameter requirements for callbacks
+        Returns the texture of the given text, or None if there is no text
+        
+        The texture is white text on a transparent background.  It is taken from
+        ``TEXT_CACHE`` if it is there.  Otherwise, the text is rendered and the texture
+        is added to the cache, dropping the least recently used texture if the cache
+        is full.
+        
+        :param text: the text to render
+        :type text:  ``str``
+        
+        :param font_name: the font file (or the default Kivy font)
+        :type font_name:  ``str``
+        
+        :param font_size: the font size in pixels
+        :type font_size:  ``int`` or ``float`` > 0
+        
+        :param bold: whether the text is bold
+        :type bold:  ``bool``
+        
+        :param halign: the alignment of the lines of a multi-line text
+        :type halign:  one of 'left', 'right', or 'center'
+        
+        :param options: the other keywords for the Kivy text renderer
+        :type options:  ``tuple`` of (keyword, value) pairs, keywords in ``TEXT_KEYWORDS``
         """
-        if self._defined:
-            self._reset()
+        if text == '':
+            return None
+        
+        key = (text,font_name,font_size,bold,halign,options)
+        if key in cls.TEXT_CACHE:
+            cls.TEXT_CACHE.move_to_end(key)
+            return cls.TEXT_CACHE[key]
+        
+        # Markup needs its own renderer, as in the Kivy Label widget
+        factory = MarkupLabel if dict(options).get('markup') else CoreLabel
+        label = factory(text=text,font_name=font_name,font_size=font_size,bold=bold,
+                        halign=halign,**dict(options))
+        label.refresh()
+        texture = label.texture
+        cls.TEXT_CACHE[key] = texture
+        while len(cls.TEXT_CACHE) > cls.TEXT_CACHE_SIZE:
+            cls.TEXT_CACHE.popitem(last=False)
+        return texture
     
     def _reset(self):
         """
         Resets the drawing cache.
         """
-        # Set up the label at the center.
-        self._label.size = self._label.texture_size
-        self._label.center = (0,0)
-        if self.linecolor:
-            self._label.color = self.linecolor
+        texture = GLabel._render(self._text,self._fname,self._fsize,self._bold,
+                                 self._halign,self._options)
+        size = (0,0) if texture is None else texture.size
         
         # Resize the outside if necessary
         self._defined = False
-        self.width  = max(self.width, self._label.width)
-        self.height = max(self.height,self._label.height)
+        self.width  = max(self.width, size[0])
+        self.height = max(self.height,size[1])
         self._defined = True
         
         # Reset the absolute anchor
@@ -663,16 +709,18 @@ class GLabel(GRectangle):
             self._trans.y = self._hv+self.height/2.0
         
         # Reset the label anchor.
+        tx = -size[0]/2.0
         if self.halign == 'left':
-            self._label.x = -self.width/2.0
+            tx = -self.width/2.0
         elif self.halign == 'right':
-            self._label.right = self.width/2.0
+            tx = self.width/2.0-size[0]
         
         # Reset the label anchor.
+        ty = -size[1]/2.0
         if self.valign == 'top':
-            self._label.top = self.height/2.0
+            ty = self.height/2.0-size[1]
         elif self.valign == 'bottom':
-            self._label.bottom = -self.height/2.0
+            ty = -self.height/2.0
         
         GObject._reset(self)
         x = -self.width/2.0
@@ -683,7 +731,9 @@ class GLabel(GRectangle):
             self._cache.add(self._fillcolor)
             self._cache.add(fill)
         
-        self._cache.add(self._label.canvas)
+        if not texture is None:
+            self._cache.add(Color(*self.linecolor) if self.linecolor else Color(1,1,1,1))
+            self._cache.add(Rectangle(pos=(tx,ty),size=size,texture=texture))
         
         if self._linewidth > 0:
             line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
@@ -691,3 +741,306 @@ class GLabel(GRectangle):
             self._cache.add(line)
         
         self._cache.add(PopMatrix())
+
+
+# #mark -
+class GBitmapLabel(object):
+    """
+    A class representing a single line of text drawn from a glyph atlas.
+    
+    A :class:`GLabel` renders its whole text to a texture, so every change to the text
+    renders it again.  That is fine for a banner, but not for a counter (like a score)
+    that changes many times a second.  A bitmap label renders the characters of its
+    font once, into one shared texture (the glyph atlas), and draws its text as a Kivy
+    ``Mesh`` with one textured quad per character.  Changing the text only rewrites the
+    vertices of the mesh, so it costs the same no matter how often it happens.
+    
+    The atlas only has the characters in ``charset`` (the printable ASCII characters by
+    default).  Any other character in the text is left out.  Characters are placed one
+    after the other, with no kerning, so this works best with fonts like ``Arcade.ttf``.
+    The text is a single line; the escape character '\\n' is not supported.
+    
+    As with :class:`GSpriteBatch`, a bitmap label cannot be rotated or scaled.  The
+    text is centered vertically on ``y``, and anchored horizontally on ``x`` according
+    to ``halign``.
+    """
+    
+    # Class attribute for tracking glyph atlases, keyed by (font, size, bold, charset)
+    FONT_CACHE = {}
+    # The characters in a glyph atlas, unless another charset is given
+    CHARSET = ''.join(chr(code) for code in range(32,127))
+    
+    # MUTABLE PROPERTIES
+    @property
+    def x(self):
+        """
+        The horizontal coordinate of the text anchor.
+        
+        **Invariant**: Must be an int or float."""
+        return self._trans.x
+    
+    @x.setter
+    def x(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        self._trans.x = float(value)
+    
+    @property
+    def y(self):
+        """
+        The vertical coordinate of the text center.
+        
+        **Invariant**: Must be an int or float."""
+        return self._trans.y
+    
+    @y.setter
+    def y(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        self._trans.y = float(value)
+    
+    @property
+    def text(self):
+        """
+        The text for this label.
+        
+        **Invariant**: Must be a string"""
+        return self._text
+    
+    @text.setter
+    def text(self,value):
+        assert type(value) == str, 'value %s is not a string' % repr(value)
+        if value != self._text:
+            self._text = value
+            self._layout()
+    
+    @property
+    def linecolor(self):
+        """
+        The color of the text.
+        
+        **Invariant**: Must be a 4-element list of floats between 0 and 1."""
+        return self._color.rgba
+    
+    @linecolor.setter
+    def linecolor(self,value):
+        from .gobject import is_color
+        import introcs
+        assert is_color(value), '%s is not a valid color' % repr(value)
+        if type(value) in [tuple, list] and len(value) == 3:
+            value = list(value)+[1.0]
+        elif type(value) in [introcs.RGB, introcs.HSV]:
+            value = value.glColor()
+        elif type(value) == str:
+            if value[0] == '#':
+                value = introcs.RGB.CreateWebColor(value).glColor()
+            else:
+                value = introcs.RGB.CreateName(value).glColor()
+        self._color.rgba = list(value)
+    
+    @property
+    def halign(self):
+        """
+        The horizontal alignment of the text on ``x``.
+        
+        If 'left', the text starts at ``x``; if 'right', it ends at ``x``; if 'center',
+        it is centered on ``x``.
+        
+        **Invariant**: Must be one of 'left', 'right', or 'center'"""
+        return self._halign
+    
+    @halign.setter
+    def halign(self,value):
+        assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
+        self._halign = value
+        self._layout()
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def font_name(self):
+        """
+        The file name for the .ttf file of the font
+        
+        **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
+        return self._fname
+    
+    @property
+    def font_size(self):
+        """
+        The size of the text font in points.
+        
+        **Invariant**: Must be a positive number (int or float)"""
+        return self._fsize
+    
+    @property
+    def width(self):
+        """
+        The width of the current text.
+        
+        **Invariant**: Must be a float >= 0."""
+        return self._width
+    
+    @property
+    def height(self):
+        """
+        The height of a line of text in this font.
+        
+        **Invariant**: Must be a float >= 0."""
+        return float(self._font[2])
+    
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new bitmap label.
+        
+        To use the constructor for this class, you should provide it with a list of 
+        keyword arguments.  For example, to make a score counter in the Arcade font, use
+        the constructor::
+            
+            GBitmapLabel(text='0',font_name='Arcade.ttf',font_size=32,x=10,y=680,halign='left')
+        
+        The keywords ``text``, ``font_name``, ``font_size``, ``bold``, ``linecolor``, 
+        ``x``, ``y`` and ``halign`` have the same meaning as in :class:`GLabel`.  The
+        keyword ``charset`` is a string with every character the label can show.  Labels
+        with the same font, size, boldness and charset share a glyph atlas.
+        
+        :param keywords: dictionary of keyword arguments 
+        :type keywords:  keys are attribute names
+        """
+        from .app import GameApp
+        self._fname = keywords['font_name'] if 'font_name' in keywords else DEFAULT_FONT
+        assert self._fname == DEFAULT_FONT or GameApp.is_font(self._fname), \
+            'value %s is not a font name' % repr(self._fname)
+        self._fsize = keywords['font_size'] if 'font_size' in keywords else sp(15)
+        assert type(self._fsize) in [int,float], 'value %s is not a number' % repr(self._fsize)
+        bold = keywords['bold'] if 'bold' in keywords else False
+        charset = keywords['charset'] if 'charset' in keywords else GBitmapLabel.CHARSET
+        self._font = GBitmapLabel._loadFont(self._fname,self._fsize,bold,charset)
+        
+        self._text = ''
+        self._halign = 'center'
+        self._width = 0.0
+        self._count = -1
+        self._trans = Translate(0,0,0)
+        self._color = Color(0,0,0,1)
+        self._mesh  = Mesh(vertices=[],indices=[],mode='triangles',texture=self._font[0])
+        
+        self._cache = InstructionGroup()
+        self._cache.add(PushMatrix())
+        self._cache.add(self._trans)
+        self._cache.add(self._color)
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
+        
+        self.x = keywords['x'] if 'x' in keywords else 0
+        self.y = keywords['y'] if 'y' in keywords else 0
+        if 'linecolor' in keywords:
+            self.linecolor = keywords['linecolor']
+        self.halign = keywords['halign'] if 'halign' in keywords else 'center'
+        self.text = keywords['text'] if 'text' in keywords else ''
+    
+    def __repr__(self):
+        """
+        :return: An unambiguous string representation of this object.
+        :rtype:  ``str``
+        """
+        return '<%s text=%s at (%s,%s)>' % (self.__class__.__name__,repr(self.text),
+                                           repr(self.x),repr(self.y))
+    
+    # PUBLIC METHODS
+    def draw(self, view):
+        """
+        Draws this label in the provided view.
+        
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        view.draw(self._cache)
+    
+    def erase(self, view):
+        """
+        Removes this label from the provided view.
+        
+        This is only needed when the view is retained (see :attr:`GView.retained`).
+        
+        :param view: view to remove this label from
+        :type view:  :class:`GView`
+        """
+        view.remove(self._cache)
+    
+    # HIDDEN METHODS
+    @classmethod
+    def _loadFont(cls,font_name,font_size,bold,charset):
+        """
+        Returns the glyph atlas of a font as a tuple (texture, glyphs, height)
+        
+        The value ``glyphs`` is a dictionary from each character of ``charset`` to a
+        pair with its advance (width) and the texture coordinates of its quad.  The 
+        charset is rendered as one line of text, which is the atlas; the glyphs are the
+        regions of that line between the extents of successive characters.  The atlas
+        is only made once for each font, size, boldness and charset.
+        
+        :param font_name: the font file (or the default Kivy font)
+        :type font_name:  ``str``
+        
+        :param font_size: the font size in pixels
+        :type font_size:  ``int`` or ``float`` > 0
+        
+        :param bold: whether the text is bold
+        :type bold:  ``bool``
+        
+        :param charset: the characters to put in the atlas
+        :type charset:  nonempty ``str``
+        """
+        key = (font_name,font_size,bold,charset)
+        if key in cls.FONT_CACHE:
+            return cls.FONT_CACHE[key]
+        
+        import numpy as np
+        label = CoreLabel(text=charset,font_name=font_name,font_size=font_size,bold=bold)
+        label.refresh()
+        texture = label.texture
+        
+        glyphs = {}
+        left = 0
+        for pos in range(len(charset)):
+            right = label.get_extents(charset[:pos+1])[0]
+            region = texture.get_region(left,0,max(right-left,0),texture.height)
+            glyphs[charset[pos]] = (right-left, np.reshape(region.tex_coords,(4,2)))
+            left = right
+        
+        result = (texture, glyphs, texture.height)
+        cls.FONT_CACHE[key] = result
+        return result
+    
+    def _layout(self):
+        """
+        Rebuilds the quads of the mesh for the current text and alignment.
+        
+        Only the vertices are replaced, unless the number of characters changed.
+        """
+        import numpy as np
+        from array import array
+        glyphs = self._font[1]
+        chars = [glyphs[c] for c in self._text if c in glyphs]
+        
+        vertices = np.zeros((len(chars),4,4),dtype=np.float32)
+        height = self._font[2]
+        left = 0.0
+        for pos, (advance, coords) in enumerate(chars):
+            vertices[pos,:,0] = (left,left+advance,left+advance,left)
+            vertices[pos,:,1] = (-height/2.0,-height/2.0,height/2.0,height/2.0)
+            vertices[pos,:,2:] = coords
+            left += advance
+        self._width = left
+        
+        if self._halign == 'center':
+            vertices[:,:,0] -= left/2.0
+        elif self._halign == 'right':
+            vertices[:,:,0] -= left
+        
+        data = array('f')
+        data.frombytes(vertices.tobytes())
+        self._mesh.vertices = data
+        if len(chars) != self._count:
+            self._count = len(chars)
+            quads = 4*np.arange(self._count)[:,None]
+            self._mesh.indices = (quads+np.array([0,1,2,2,3,0])).ravel().tolist()
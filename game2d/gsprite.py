@@ -130,18 +130,9 @@ class GSprite(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        texture = GameApp.load_texture(self.source)
-        if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += width
+        frames = GameApp.load_frames(self.source,self._format)
+        if frames:
+            self._images = frames
         else:
             print('Failed to load',repr(self.source))
         
@@ -160,3 +151,221 @@ class GSprite(GRectangle):
         
         self._cache.add(PopMatrix())
 
+
+# #mark -
+class GSpriteBatch(object):
+    """
+    A class representing many sprites that share a filmstrip.
+    
+    A batch draws up to ``capacity`` sprites, all of the same size and all cut from the
+    same filmstrip, with a single Kivy ``Mesh``.  Each sprite is a quad in the mesh with
+    its own position and texture coordinates.  That replaces one instruction group per
+    sprite (each with its own matrix, color and rectangle) with one instruction for the 
+    whole batch, which matters when there are many small sprites like a wave of aliens.
+    
+    The sprites are numbered 0..capacity-1.  Their positions, frames and visibility are
+    set all at once with :meth:`place`, usually once per animation frame.  The vertex
+    buffer is only rebuilt for the sprites that changed, and it is only sent to the 
+    graphics card when something changed.
+    
+    The sprites in a batch cannot be rotated or scaled, and they ignore any view 
+    transforms other than the one of the view itself.
+    """
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the filmstrip.
+        
+        **invariant**. Value is a string refering to a valid file.
+        """
+        return self._source
+    
+    @property
+    def count(self):
+        """
+        The number of frames in the filmstrip
+        
+        **invariant**. Value is an int > 0.
+        """
+        return self._format[0]*self._format[1]
+    
+    @property
+    def capacity(self):
+        """
+        The number of sprites in this batch
+        
+        **invariant**. Value is an int > 0.
+        """
+        return self._capacity
+    
+    @property
+    def width(self):
+        """
+        The width of each sprite.
+        
+        **invariant**. Value is a float > 0.
+        """
+        return self._width
+    
+    @property
+    def height(self):
+        """
+        The height of each sprite.
+        
+        **invariant**. Value is a float > 0.
+        """
+        return self._height
+    
+    
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new batch of sprites, all of them hidden
+        
+        To use the constructor for this class, you should provide it with a list of 
+        keyword arguments.  For example, to make a batch of 60 aliens from the filmstrip 
+        ``alien-strip1.png``, which has 4 rows and 2 columns, use the constructor::
+            
+            GSpriteBatch(source='alien-strip1.png',format=(4,2),width=33,height=33,capacity=60)
+        
+        The keywords ``source``, ``width``, ``height`` and ``format`` have the same meaning
+        as in :class:`GSprite`.  The keyword ``capacity`` is the number of sprites.  The
+        sprites are never tinted.
+        
+        :param keywords: dictionary of keyword arguments 
+        :type keywords:  keys are attribute names
+        """
+        import numpy as np
+        source = keywords['source']
+        assert GameApp.is_image(source), '%s is not an image file' % repr(source)
+        format = keywords['format'] if 'format' in keywords else (1,1)
+        assert type(format) == tuple and len(format) == 2, '%s does is not a tuple pair' % repr(format)
+        assert type(format[0]) == int and type(format[1]) == int, '%s does not have int values' % repr(format)
+        assert format[0] > 0 and format[1] > 0, '%s does not have valid values' % repr(format)
+        capacity = keywords['capacity']
+        # Kivy mesh indices are 16 bits
+        assert type(capacity) == int and 0 < capacity <= 16384, '%s is not a valid capacity' % repr(capacity)
+        
+        self._source   = source
+        self._format   = format
+        self._capacity = capacity
+        self._width  = float(keywords['width'])  if 'width'  in keywords else 1.0
+        self._height = float(keywords['height']) if 'height' in keywords else 1.0
+        
+        # The last values given to place; a frame of -1 forces the first update
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._frame = np.full(capacity,-1,dtype=int)
+        self._visible = np.zeros(capacity,dtype=bool)
+        
+        # The corners of each quad (counter-clockwise from bottom left) and their vertices
+        self._cornerx = np.array([-1,1,1,-1])*(self._width/2.0)
+        self._cornery = np.array([-1,-1,1,1])*(self._height/2.0)
+        self._vertices = np.zeros((capacity,4,4),dtype=np.float32)
+        self._dirty = False
+        
+        texture = GameApp.load_texture(source)
+        if texture is None:
+            print('Failed to load',repr(source))
+        self._coords = self._frameCoords(GameApp.load_frames(source,format))
+        
+        self._mesh = Mesh(vertices=[],indices=[],mode='triangles',texture=texture)
+        self._cache = InstructionGroup()
+        self._cache.add(Color(1,1,1))
+        self._cache.add(self._mesh)
+    
+    
+    # PUBLIC METHODS
+    def place(self,x,y,frame,visible=None):
+        """
+        Sets the position, frame and visibility of every sprite in this batch.
+        
+        Each argument is a sequence (such as a NumPy array) with one value per sprite.
+        Only the sprites whose values changed since the last call are updated.
+        
+        :param x: the horizontal coordinate of each sprite center
+        :type x:  sequence of ``capacity`` numbers
+        
+        :param y: the vertical coordinate of each sprite center
+        :type y:  sequence of ``capacity`` numbers
+        
+        :param frame: the animation frame of each sprite
+        :type frame:  sequence of ``capacity`` ints 0..count-1
+        
+        :param visible: whether each sprite is drawn (all of them if None)
+        :type visible:  sequence of ``capacity`` bools, or None
+        """
+        import numpy as np
+        x = np.asarray(x,dtype=float).ravel()
+        y = np.asarray(y,dtype=float).ravel()
+        frame = np.asarray(frame,dtype=int).ravel()
+        visible = np.ones(self._capacity,dtype=bool) if visible is None else np.asarray(visible,dtype=bool).ravel()
+        assert len(x) == len(y) == len(frame) == len(visible) == self._capacity, \
+            'place needs %d values for each sprite' % self._capacity
+        
+        if (visible != self._visible).any():
+            self._visible = visible.copy()
+            quads = 4*np.flatnonzero(visible)[:,None]
+            self._mesh.indices = (quads+np.array([0,1,2,2,3,0])).ravel().tolist()
+        
+        changed = (x != self._x) | (y != self._y) | (frame != self._frame)
+        if changed.any():
+            assert frame.min() >= 0 and frame.max() < self.count, 'a frame is out of range'
+            self._x[changed] = x[changed]
+            self._y[changed] = y[changed]
+            self._frame[changed] = frame[changed]
+            self._vertices[changed,:,0] = x[changed,None] + self._cornerx
+            self._vertices[changed,:,1] = y[changed,None] + self._cornery
+            self._vertices[changed,:,2:] = self._coords[frame[changed]]
+            self._dirty = True
+    
+    def draw(self, view):
+        """
+        Draws this batch in the provide view.
+        
+        The vertex buffer is sent to the graphics card first, if any sprite changed.
+        
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        if self._dirty:
+            from array import array
+            vertices = array('f')
+            vertices.frombytes(self._vertices.tobytes())
+            self._mesh.vertices = vertices
+            self._dirty = False
+        view.draw(self._cache)
+    
+    def erase(self, view):
+        """
+        Removes this batch from the provided view.
+        
+        This is only needed when the view is retained (see :attr:`GView.retained`).
+        
+        :param view: view to remove this batch from
+        :type view:  :class:`GView`
+        """
+        view.remove(self._cache)
+    
+    
+    # HIDDEN METHODS
+    def _frameCoords(self,frames):
+        """
+        Returns the texture coordinates of the corners of every frame.
+        
+        The result is a (count,4,2) array, with the corners in the same order as the
+        quads.  Frames are arranged left-to-right, top-to-bottom, as in :class:`GSprite`.
+        
+        :param frames: the frames of the filmstrip (see :meth:`GameApp.load_frames`)
+        :type frames:  ``tuple`` of ``Texture`` or None
+        """
+        import numpy as np
+        coords = np.zeros((self.count,4,2),dtype=np.float32)
+        if frames is None:
+            return coords
+        
+        for index, region in enumerate(frames):
+            coords[index] = np.reshape(region.tex_coords,(4,2))
+        return coords
@@ -25,6 +25,12 @@ class GInput(object):
     to the user.  To access mouse information, simply access the attribute ``touch``.
     To access keyboard information, use the method :meth:`is_key_down`.
 
+    Key presses and releases are also queued as events.  The events that arrived since
+    the last call to `update` are available in the attribute ``events``, and the methods
+    :meth:`was_key_pressed` and :meth:`was_key_released` test for them.  This means there
+    is no need to remember the key state from the last update to detect a new press,
+    and a key that is pressed and released between two updates is never missed.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly hook it up to the keyboard and mouse.  Instead,
     you should only use the one provided in the `input` attribute of :class:`GameApp`.
@@ -124,6 +130,22 @@ class GInput(object):
         """
         return tuple(k for (k,v) in self._keystate.items() if v)
 
+    @property
+    def events(self):
+        """
+        The key events that arrived since the last update, in order.
+
+        Each event is a pair (key, down), where key is the name of the key and down is
+        True for a press and False for a release.  Held keys that repeat are only
+        pressed once.  The events are cleared at the start of every call to `update`
+        in :class:`GameApp`, so each event is seen by exactly one update.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a tuple of (``str``, ``bool``) pairs (possibly empty)
+        """
+        return self._events
+
 
     # BUILT-IN METHODS
     def __init__(self):
@@ -145,6 +167,11 @@ class GInput(object):
         self._keystate = {}
         self._keycount = 0
 
+        self._events  = ()
+        self._pending = []
+        self._pressed  = frozenset()
+        self._released = frozenset()
+
 
     # PUBLIC METHODS
     def is_key_down(self,key):
@@ -173,6 +200,36 @@ class GInput(object):
         """
         return key in self._keystate and self._keystate[key]
 
+    def was_key_pressed(self,key):
+        """
+        Checks whether the key was pressed since the last update.
+
+        This is True for exactly one update after each press of the key, even if the
+        key was released again before that update.  Use it for actions that should only
+        happen once per press, like firing a shot or pausing the game::
+
+            input.was_key_pressed('spacebar')
+
+        :param key: the key to test
+        :type key:  ``str``
+
+        :return: True if ``key`` was pressed since the last update
+        :rtype:  ``bool``
+        """
+        return key in self._pressed
+
+    def was_key_released(self,key):
+        """
+        Checks whether the key was released since the last update.
+
+        :param key: the key to test
+        :type key:  ``str``
+
+        :return: True if ``key`` was released since the last update
+        :rtype:  ``bool``
+        """
+        return key in self._released
+
     def is_touch_down(self):
         """
         Checks wether the mouse is currently held down.
@@ -187,6 +244,21 @@ class GInput(object):
 
 
     # HIDDEN METHODS
+    def _advance(self):
+        """
+        Moves the queued key events into ``events`` for the next update.
+
+        This method is called by :class:`GameApp` just before each call to `update`.
+        """
+        self._events = tuple(self._pending)
+        self._pending = []
+        if self._events:
+            self._pressed  = frozenset(k for (k,down) in self._events if down)
+            self._released = frozenset(k for (k,down) in self._events if not down)
+        else:
+            self._pressed  = frozenset()
+            self._released = frozenset()
+
     def _register(self,view):
         """
         Registers the view with this input handler; activating it.
@@ -246,6 +318,7 @@ class GInput(object):
         self._keyboard = None
         self._keystate = {}
         self._keycount = 0
+        self._pending = []
 
     def _capture_key(self, keyboard, keycode, text, modifiers):
         """
@@ -267,6 +340,7 @@ class GInput(object):
         # Need to handle the case where a release was dropped
         if not k in self._keystate or not self._keystate[k]:
             self._keycount += 1
+            self._pending.append((k,True))
         self._keystate[k] = True
         return True
 
@@ -282,6 +356,7 @@ class GInput(object):
         """
         self._keystate[keycode[1]] = False
         self._keycount -= 1
+        self._pending.append((keycode[1],False))
         return True
 
     def _capture_touch(self,view,touch):
@@ -323,8 +398,35 @@ class GView(FloatLayout):
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
+
+    A view can also be retained (see the attribute ``retained``).  A retained view is
+    not cleared between frames.  Instead, each object stays on screen from the first
+    time it is drawn until it is removed with :meth:`remove` (or the ``erase`` method
+    of the object).  Moving an object only changes its own transform, so the canvas
+    is only changed when objects are added or removed.
     """
 
+    # MUTABLE ATTRIBUTES
+    @property
+    def retained(self):
+        """
+        Whether this view keeps its contents from one frame to the next.
+
+        If False (the default), :class:`GameApp` clears the view at the start of every
+        frame, and everything must be drawn again.  If True, the view is never cleared
+        for you; objects are drawn once, and stay until they are removed.  Drawing an
+        object that is already in the view does nothing, so it is safe to keep drawing
+        every object every frame.  Newer objects are drawn on top of older ones.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -341,6 +443,7 @@ class GView(FloatLayout):
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self._retained = False
 
 
     # PUBLIC METHODS
@@ -358,12 +461,28 @@ class GView(FloatLayout):
             self._frame.add(cmd)
             self._contents.add(cmd)
 
+    def remove(self,cmd):
+        """
+        Removes the given Kivy graphics command from this view.
+
+        You should never call this method, since you do not understand raw Kivy graphics
+        commands.  Instead, you should use the `erase` method in :class:`GObject` instead.
+        Removing a command that is not in the view does nothing.
+
+        :param cmd: the command to remove
+        :type cmd:  A Kivy graphics command
+        """
+        if cmd in self._contents:
+            self._frame.remove(cmd)
+            self._contents.remove(cmd)
+
     def clear(self):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame, unless the view is retained.  That way, you are not drawing images on
+        top of one another.
         """
         self._frame.clear()
         self._contents.clear()
@@ -0,0 +1,200 @@
+"""
+A module to load the assets of a game in the background.
+
+Loading an image or a sound the first time it is used reads it from disk in the middle
+of the game, which can stall an animation frame.  A preloader reads every file in the
+**Images**, **Sounds** and **Fonts** folders in a background thread, while the game
+shows a title screen.  The work that must happen on the main thread (making textures
+on the graphics card and opening sounds) is done a few assets at a time, each time
+:meth:`Preloader.update` is called.  Once an asset is preloaded, :meth:`GameApp.load_texture`
+and :class:`Sound` use it without touching the disk.
+"""
+from .app import GameApp
+import os
+import os.path
+import queue
+import threading
+
+# The file extensions of each kind of asset
+SOUND_EXTENSIONS = ('.wav', '.mp3', '.ogg')
+FONT_EXTENSIONS  = ('.ttf', '.otf')
+
+
+# #mark -
+class Preloader(object):
+    """
+    A class that loads the assets of a game in a background thread.
+
+    A preloader is made (and started) when the game starts, usually in the method
+    ``start`` of :class:`GameApp`.  Then :meth:`update` is called once per animation
+    frame until the preloader is :attr:`done`, and :attr:`progress` can be shown on
+    screen.  For example::
+
+        self.preloader = Preloader()
+        self.preloader.start()
+        ...
+        self.preloader.update()
+        message.text = 'Loading %d%%' % int(100*self.preloader.progress)
+
+    The background thread only decodes images and reads files.  Images are made into
+    textures (and added to ``GameApp.TEXTURE_CACHE``) by :meth:`update`.  Each sound is
+    opened by :meth:`update` as many times as its number of ``voices``, and the copies
+    are kept in ``GameApp.SOUND_CACHE`` until a :class:`Sound` claims them.  Fonts are
+    read so that they are in memory the first time a label uses them.  Images in the
+    texture atlas (see :class:`TextureAtlas`) are already loaded, and are skipped.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def total(self):
+        """
+        The number of assets to load.
+
+        **Invariant**: Must be an int >= 0
+        """
+        return len(self._assets)
+
+    @property
+    def loaded(self):
+        """
+        The number of assets handed to the game so far.
+
+        **Invariant**: Must be an int 0..total
+        """
+        return self._loaded
+
+    @property
+    def progress(self):
+        """
+        The fraction of the assets handed to the game so far.
+
+        **Invariant**: Must be a float 0..1
+        """
+        return 1.0 if len(self._assets) == 0 else self._loaded/len(self._assets)
+
+    @property
+    def done(self):
+        """
+        Whether every asset has been handed to the game.
+
+        **Invariant**: Must be a bool
+        """
+        return self._loaded == len(self._assets)
+
+
+    # BUILT-IN METHODS
+    def __init__(self, voices=None):
+        """
+        Creates a new preloader for every asset of the game.
+
+        The preloader does not start loading until :meth:`start` is called.
+
+        :param voices: the number of copies to open of each sound (1 if not given)
+        :type voices:  ``dict`` from sound file names to ``int`` > 0, or None
+        """
+        from .atlas import IMAGE_EXTENSIONS
+        self._voices = {} if voices is None else dict(voices)
+        self._assets = []
+        for kind, folder, extensions in (('image', GameApp.images, IMAGE_EXTENSIONS),
+                                         ('sound', GameApp.sounds, SOUND_EXTENSIONS),
+                                         ('font',  GameApp.fonts,  FONT_EXTENSIONS)):
+            if os.path.isdir(folder):
+                for name in sorted(os.listdir(folder)):
+                    if os.path.splitext(name)[1].lower() in extensions:
+                        self._assets.append((kind, name, os.path.join(folder, name)))
+
+        self._ready  = queue.Queue()
+        self._loaded = 0
+        self._thread = None
+
+    def __repr__(self):
+        """
+        Returns an unambiguous representation of this preloader.
+        """
+        return '<%s %d of %d assets>' % (self.__class__.__name__, self._loaded, len(self._assets))
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts loading the assets in a background thread.
+
+        Calling this method more than once does nothing.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, daemon=True)
+            self._thread.start()
+
+    def update(self, limit=2):
+        """
+        Hands up to ``limit`` assets read by the background thread to the game.
+
+        This method must be called on the main thread (for example, in ``update``),
+        since it makes textures and opens sounds.  It never waits for the background
+        thread.  An asset that cannot be loaded is skipped; it will be loaded (or fail)
+        the first time it is used, as it would without a preloader.
+
+        :return: True if every asset has been handed to the game
+        :rtype:  ``bool``
+
+        :param limit: the most assets to hand over in this call
+        :type limit:  ``int`` > 0
+        """
+        from kivy.core.audio import SoundLoader
+        for step in range(limit):
+            try:
+                kind, name, data = self._ready.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'image' and not data is None:
+                if not name in GameApp.TEXTURE_CACHE and not (GameApp.ATLAS and name in GameApp.ATLAS):
+                    GameApp.TEXTURE_CACHE[name] = data.texture
+            elif kind == 'sound' and not data is None:
+                sounds = GameApp.SOUND_CACHE.setdefault(name, [])
+                while len(sounds) < self._voices.get(name, 1):
+                    sound = SoundLoader.load(name)
+                    if sound is None:
+                        break
+                    sounds.append(sound)
+            self._loaded += 1
+        return self.done
+
+
+    # HIDDEN METHODS
+    def _work(self):
+        """
+        Reads every asset, in the background thread.
+        """
+        for kind, name, path in self._assets:
+            try:
+                data = self._read(kind, name, path)
+            except Exception:
+                data = None
+            self._ready.put((kind, name, data))
+
+    def _read(self, kind, name, path):
+        """
+        Returns the data of an asset that can be read off the main thread.
+
+        Images are decoded (but not made into textures).  Sounds and fonts are read so
+        that the main thread finds them in memory; the result is True for them.
+
+        :param kind: the kind of asset
+        :type kind:  one of 'image', 'sound' or 'font'
+
+        :param name: the file name of the asset
+        :type name:  ``str``
+
+        :param path: the full path to the file
+        :type path:  ``str``
+        """
+        if kind == 'image':
+            if GameApp.ATLAS and name in GameApp.ATLAS:
+                return None
+            from kivy.core.image import ImageLoader
+            return ImageLoader.load(path, keep_data=True)
+
+        with open(path, 'rb') as file:
+            file.read()
+        return True
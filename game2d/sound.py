@@ -6,10 +6,144 @@ This classes wrap the Kivy audio interface, making it simpler for students to us
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
 from .app import GameApp
+import weakref
 
 
+class Mixer(object):
+    """
+    A class representing the volume controls for every sound in the game.
+    
+    Each sound belongs to a bus, either 'music' or 'effects', and each bus has its own
+    volume.  The volume that you actually hear is the volume of the sound, times the
+    volume of its bus, times the ``master`` volume, or 0 if the mixer is ``muted``.
+    
+    Changing a volume (or muting) updates every sound that it affects right away, and
+    only when the value actually changes.  So there is no need to set the volume of
+    each sound over and over.  There is one mixer for the whole game, the object
+    ``mixer`` in this module.  Sounds join it when they are created.
+    """
+    
+    # The names of the buses
+    BUSES = ('music','effects')
+    
+    # MUTABLE PROPERTIES
+    @property
+    def master(self):
+        """
+        The volume of every sound.
+        
+        1 means full volume, 0 means silence.  The default value is 1.
+        
+        **Invariant**: Must float in the range 0..1.
+        """
+        return self._master
+    
+    @master.setter
+    def master(self,value):
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        if value != self._master:
+            self._master = value
+            for bus in self.BUSES:
+                self._apply(bus)
+    
+    @property
+    def muted(self):
+        """
+        Whether every sound is silenced.
+        
+        Muting does not change any volume, so unmuting restores the sound exactly as
+        it was.  The default value is False.
+        
+        **Invariant**: Must be a boolean.
+        """
+        return self._muted
+    
+    @muted.setter
+    def muted(self,value):
+        assert type(value) == bool, repr(value)+' is not a bool'
+        if value != self._muted:
+            self._muted = value
+            for bus in self.BUSES:
+                self._apply(bus)
+    
+    def __init__(self):
+        """
+        Creates a new mixer at full volume with no sounds.
+        """
+        self._master = 1
+        self._muted  = False
+        self._volume = dict((bus,1) for bus in self.BUSES)
+        # The sounds of each bus (a sound that is no longer used leaves by itself)
+        self._sounds = dict((bus,weakref.WeakSet()) for bus in self.BUSES)
+    
+    # PUBLIC METHODS
+    def get_volume(self,bus):
+        """
+        :return: The volume of the given bus (not counting the master volume)
+        :rtype:  ``float`` in the range 0..1
+        
+        :param bus: The name of a bus
+        :type bus:  one of ``Mixer.BUSES``
+        """
+        assert bus in self.BUSES, '%s is not a bus' % repr(bus)
+        return self._volume[bus]
+    
+    def set_volume(self,bus,value):
+        """
+        Sets the volume of the given bus.
+        
+        :param bus: The name of a bus
+        :type bus:  one of ``Mixer.BUSES``
+        
+        :param value: The new volume of the bus
+        :type value:  ``float`` in the range 0..1
+        """
+        assert bus in self.BUSES, '%s is not a bus' % repr(bus)
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        if value != self._volume[bus]:
+            self._volume[bus] = value
+            self._apply(bus)
+    
+    def level(self,bus):
+        """
+        :return: The factor for the volume of every sound in the given bus
+        :rtype:  ``float`` in the range 0..1
+        
+        :param bus: The name of a bus
+        :type bus:  one of ``Mixer.BUSES``
+        """
+        return 0 if self._muted else self._master*self._volume[bus]
+    
+    # HIDDEN METHODS
+    def _add(self,sound):
+        """
+        Adds a sound to its bus.
+        
+        :param sound: The sound to add
+        :type sound:  :class:`Sound`
+        """
+        self._sounds[sound.bus].add(sound)
+    
+    def _apply(self,bus):
+        """
+        Updates the volume of every sound in the given bus.
+        
+        :param bus: The name of a bus
+        :type bus:  one of ``Mixer.BUSES``
+        """
+        level = self.level(bus)
+        for sound in list(self._sounds[bus]):
+            sound._apply(level)
+
+
+# The mixer of every sound in the game
+mixer = Mixer()
+
+
+# #mark -
 class Sound(object):
     """
     A class representing a sound object that can be played.
@@ -21,7 +155,11 @@ class Sound(object):
     
     When a sound is played, it cannot be played again until it finishes, or is stopped.  
     This means that if you want multiple, simultaneous sound effects from the same WAV 
-    file.you will need to create multiple Sound objects.
+    file.you will need to create multiple Sound objects.  The class :class:`SoundPool`
+    does this for you.
+    
+    Every sound belongs to a bus of the :class:`Mixer` ``mixer``, 'effects' unless you
+    say otherwise.  The volume of the sound is combined with the volume of its bus.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
@@ -32,17 +170,20 @@ class Sound(object):
         """
         The current sound volume.
         
-        1 means full volume, 0 means mute.  The default value is 1.
+        1 means full volume, 0 means mute.  The default value is 1.  This is the volume
+        of this sound alone; it is multiplied by the volume of its bus in the mixer.
         
         **Invariant**: Must float in the range 0..1.
         """
-        return self._sound.volume
+        return self._volume
     
     @volume.setter
     def volume(self,value):
         assert type(value) in [int, float] and value >= 0 and value <= 1, \
             'value %s is not a valid volume' % repr(value)
-        self._sound.volume = value
+        if value != self._volume:
+            self._volume = value
+            self._apply(mixer.level(self._bus))
     
     # IMMUTABLE PROPERTIES
     @property
@@ -56,6 +197,17 @@ class Sound(object):
         """ 
         return self._source
     
+    @property
+    def bus(self):
+        """
+        The mixer bus of this sound.
+        
+        **Immutable**: This value cannot be changed after the sound is loaded.
+        
+        **Invariant**: Must be one of ``Mixer.BUSES``.
+        """ 
+        return self._bus
+    
     @property
     def playing(self):
         """
@@ -68,19 +220,27 @@ class Sound(object):
         """ 
         return self._sound.state == 'play'
     
-    def __init__(self,source):
+    def __init__(self,source,bus='effects'):
         """
         Creates a new sound from a file.
         
         :param source: The string providing the name of a sound file
         :type source:  ``str``
+        
+        :param bus: The mixer bus of the sound
+        :type bus:  one of ``Mixer.BUSES``
         """
         from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
+        assert bus in Mixer.BUSES, '%s is not a bus' % repr(bus)
         self._source = source
-        self._sound  = SoundLoader.load(source)
+        self._sound  = GameApp.load_sound(source)
         if self._sound is None:
             raise IOError('Module game2d cannot read the file %s' % repr(source))
+        self._bus = bus
+        self._volume = 1
+        self._apply(mixer.level(bus))
+        mixer._add(self)
     
     def play(self,loop=False):
         """
@@ -101,6 +261,154 @@ class Sound(object):
         This will stop the sound immediately, even if it is looping.
         """
         self._sound.stop()
+    
+    def _apply(self,level):
+        """
+        Sets the volume of the Kivy sound from the volume of this sound and its bus.
+        
+        :param level: The factor of the bus (see :meth:`Mixer.level`)
+        :type level:  ``float`` in the range 0..1
+        """
+        self._sound.volume = self._volume*level
+
+
+# #mark -
+class SoundPool(object):
+    """
+    A class representing a sound effect that can overlap itself.
+    
+    A pool loads several copies (voices) of the same sound file when it is created.
+    Each call to :meth:`play` plays the next voice that is not playing, going round the 
+    voices in order.  If every voice is playing, the one that started the longest time
+    ago is stopped and played again.  So a sound played many times in a row (like the
+    shot of a laser) is never cut off until there are more overlapping copies than
+    voices, and playing it never loads the file again.
+    
+    A pool has the same attributes and methods as a :class:`Sound`, so it can be used
+    anywhere a sound can.
+    """
+    
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The current volume of every voice.
+        
+        1 means full volume, 0 means mute.  The default value is 1.
+        
+        **Invariant**: Must float in the range 0..1.
+        """
+        return self._volume
+    
+    @volume.setter
+    def volume(self,value):
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        self._volume = value
+        for voice in self._voices:
+            voice.volume = value
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for this sound. 
+        
+        **Immutable**: This value cannot be changed after the sound is loaded.
+        
+        **Invariant**: Must be a nonempty string.
+        """ 
+        return self._source
+    
+    @property
+    def bus(self):
+        """
+        The mixer bus of every voice.
+        
+        **Immutable**: This value cannot be changed after the sound is loaded.
+        
+        **Invariant**: Must be one of ``Mixer.BUSES``.
+        """ 
+        return self._voices[0].bus
+    
+    @property
+    def voices(self):
+        """
+        The number of copies of this sound that can play at once.
+        
+        **Immutable**: This value cannot be changed after the sound is loaded.
+        
+        **Invariant**: Must be an int > 0.
+        """ 
+        return len(self._voices)
+    
+    @property
+    def playing(self):
+        """
+        Whether or not any voice is currently playing.
+        
+        **Immutable**: This value cannot be changed.  You should use the :meth:`play` 
+        and :meth:`stop` methods to alter its value.
+        
+        **Invariant**: Must be a boolean.
+        """ 
+        for voice in self._voices:
+            if voice.playing:
+                return True
+        return False
+    
+    def __init__(self,source,voices=4,bus='effects'):
+        """
+        Creates a new pool of voices from a file.
+        
+        :param source: The string providing the name of a sound file
+        :type source:  ``str``
+        
+        :param voices: The number of copies of the sound to load
+        :type voices:  ``int`` > 0
+        
+        :param bus: The mixer bus of every voice
+        :type bus:  one of ``Mixer.BUSES``
+        """
+        assert type(voices) == int and voices > 0, 'voices %s is not a valid number' % repr(voices)
+        self._source = source
+        self._voices = [Sound(source,bus) for voice in range(voices)]
+        self._volume = 1
+        # The play count when each voice last started, and the next voice to try
+        self._started = [0]*voices
+        self._count = 0
+        self._next  = 0
+    
+    def play(self,loop=False):
+        """
+        Plays this sound on a free voice (or the oldest one, if none are free).
+        
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        """
+        size = len(self._voices)
+        chosen = None
+        for step in range(size):
+            index = (self._next+step) % size
+            if not self._voices[index].playing:
+                chosen = index
+                break
+        
+        if chosen is None:
+            chosen = self._started.index(min(self._started))
+            self._voices[chosen].stop()
+        
+        self._count += 1
+        self._started[chosen] = self._count
+        self._next = (chosen+1) % size
+        self._voices[chosen].play(loop)
+
+    def stop(self):
+        """
+        Stops every voice of this sound.
+        """
+        for voice in self._voices:
+            voice.stop()
 
 
 # #mark -
@@ -118,12 +426,28 @@ class SoundLibrary(object):
     To play the sound, we access it as follows::
         
         soundlib['soundname'].play()
+    
+    Every sound in the library joins the same mixer bus, given when the library is made.
     """
     
-    def __init__(self):
+    @property
+    def bus(self):
+        """
+        The mixer bus of every sound in this library.
+        
+        **Invariant**: Must be one of ``Mixer.BUSES``.
+        """ 
+        return self._bus
+    
+    def __init__(self,bus='effects'):
         """
         Creates a new, empty sound library.
+        
+        :param bus: The mixer bus of the sounds in this library
+        :type bus:  one of ``Mixer.BUSES``
         """
+        assert bus in Mixer.BUSES, '%s is not a bus' % repr(bus)
+        self._bus  = bus
         self._data = {}
     
     def __len__(self):
@@ -155,7 +479,7 @@ class SoundLibrary(object):
         :param filename: The name of the file containing the sound source
         :type filename:  ``str``
         """
-        self._data[key] = Sound(filename)
+        self._data[key] = Sound(filename,self._bus)
     
     def __delitem__(self, key):
         """
@@ -0,0 +1,192 @@
+"""
+Headless support module for Alien Invaders
+
+This module contains the pieces needed to run a Wave with no display.  A Wave
+only talks to its input through the methods is_key_down and was_key_pressed,
+so any object with those methods can stand in for the GInput provided by
+GameApp.  This module provides such an object, which is driven by code
+instead of the keyboard.
+
+Nothing in this module (or in wave.py and models.py) imports Kivy, so waves
+can be simulated on machines without a display or an audio device.
+"""
+from consts import *
+from wave import Wave
+
+
+class HeadlessInput(object):
+    """
+    A class representing a synthetic input handler.
+
+    This class has the same keyboard interface as GInput, but the keys are
+    pressed and released by code.  To simulate a frame where the player holds
+    the left arrow and fires, use
+
+        input.press('left', 'spacebar')
+        wave.update(input, dt)
+
+    The key names are the same as the ones used by Kivy (and GInput).  Each
+    call to press is one update: the keys that were not held down in the last
+    one count as pressed, and the ones that are no longer held count as released.
+    A short tap between two updates (a key pressed and released again) can be
+    added with tap.
+    """
+    # Attribute _keystate: the set of keys currently held down
+    # Invariant: _keystate is a set of strings
+    #
+    # Attribute _pressed: the keys pressed since the last update
+    # Invariant: _pressed is a set of strings
+    #
+    # Attribute _released: the keys released since the last update
+    # Invariant: _released is a set of strings
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down.
+        """
+        return len(self._keystate)
+
+    @property
+    def keys(self):
+        """
+        The tuple of keys that are currently held down.
+        """
+        return tuple(self._keystate)
+
+    @property
+    def events(self):
+        """
+        The key events since the last update, as (key, down) pairs.
+
+        Unlike GInput, the order of the events is not known, so all of the
+        releases come before all of the presses.
+        """
+        return (tuple((key, False) for key in self._released) +
+                tuple((key, True) for key in self._pressed))
+
+    def __init__(self, *keys):
+        """
+        Initializes an input handler with the given keys already held down
+
+        The keys do not count as pressed in the first update.
+
+        Parameter keys: the keys to hold down
+        Precondition: each key is a string
+        """
+        self._keystate = set(keys)
+        self._pressed = set()
+        self._released = set()
+
+    def is_key_down(self, key):
+        """
+        Returns True if the key is currently held down
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self._keystate
+
+    def was_key_pressed(self, key):
+        """
+        Returns True if the key was pressed since the last update
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self._pressed
+
+    def was_key_released(self, key):
+        """
+        Returns True if the key was released since the last update
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self._released
+
+    def is_touch_down(self):
+        """
+        Returns False, as there is no mouse in a headless game
+        """
+        return False
+
+    def press(self, *keys):
+        """
+        Starts a new update, holding down exactly the given keys
+
+        Parameter keys: the keys to hold down
+        Precondition: each key is a string
+        """
+        keys = set(keys)
+        self._pressed = keys - self._keystate
+        self._released = self._keystate - keys
+        self._keystate = keys
+
+    def tap(self, *keys):
+        """
+        Marks the keys as pressed in this update, even if they are not held down
+
+        Keys that are not held down are marked as released as well, as if they
+        were pressed and released again since the last update.
+
+        Parameter keys: the keys to tap
+        Precondition: each key is a string
+        """
+        self._pressed.update(keys)
+        self._released.update(key for key in keys if key not in self._keystate)
+
+    def release(self):
+        """
+        Starts a new update, releasing all of the keys
+        """
+        self.press()
+
+
+def simulate(policy, seed=None, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW,
+             dt=1.0/TICK_RATE, limit=None):
+    """
+    Returns (score, ticks, outcome) after playing a wave headless with a policy
+
+    The policy is called before every update with the wave, and it returns
+    the action to take (an index into ACTION_KEYS).  It should only use the
+    wave getters.  As there is no player to unpause the game, a destroyed
+    ship is replaced at once.  The outcome is one of the OUTCOME constants,
+    and it is OUTCOME_NONE if the game did not end within limit updates.
+
+    Parameter policy: the agent playing the game
+    Precondition: policy is a function taking a Wave and returning an int
+
+    Parameter seed: the random seed of the wave, or None to pick one at random
+    Precondition: seed is None or an int >= 0
+
+    Parameter rows: the number of rows of aliens
+    Precondition: rows is an int > 0
+
+    Parameter cols: the number of aliens in each row
+    Precondition: cols is an int > 0
+
+    Parameter dt: the number of seconds in a single update
+    Precondition: dt is a float > 0
+
+    Parameter limit: the most updates to play, or None for no limit
+    Precondition: limit is None or an int >= 0
+    """
+    wave = Wave(rows, cols, seed)
+    input = HeadlessInput()
+
+    ticks = 0
+    while wave.getOutcome() is None and (limit is None or ticks < limit):
+        if wave.getShip() is None:
+            wave.createShip()
+        input.press(*ACTION_KEYS[policy(wave)])
+        wave.update(input, dt)
+        ticks += 1
+
+    if wave.getOutcome() == "win":
+        outcome = OUTCOME_WIN
+    elif wave.getOutcome() == "lose":
+        outcome = OUTCOME_LOSE
+    else:
+        outcome = OUTCOME_NONE
+    return (wave.getScore(), ticks, outcome)
@@ -26,15 +26,218 @@ about whether to make a new class or not, please ask on Piazza.
 # DATE COMPLETED HERE
 """
 from consts import *
-from game2d import *
+import numpy as np
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
 # be a parameter in your method, and Wave should pass it as a argument when it
 # calls the method.
 
+# HEADLESS RULE: Models are plain numbers first.  The game2d drawables (and
+# with them Kivy) are only imported the first time a model is drawn to a view,
+# so the game rules can be simulated on machines with no display at all.
 
-class Ship(GSprite):
+
+class Model(object):
+    """
+    A class representing the plain numeric state of an object on screen.
+
+    A model has a center (x,y) and a size, just like a GObject, and supports the
+    same (unrotated) bounding box test in contains.  However, it does not create
+    any Kivy graphics instructions.  The drawable for the model is only created
+    the first time draw is called, and it is then kept in sync with the model
+    every time the model is drawn.
+
+    Subclasses should implement _makeSprite to build their drawable.  A plain
+    Model has no drawable, so drawing it does nothing.
+    """
+    # Attribute x: the horizontal coordinate of the model center
+    # Invariant: x is an int or float
+    #
+    # Attribute y: the vertical coordinate of the model center
+    # Invariant: y is an int or float
+    #
+    # Attribute width: the width of the model
+    # Invariant: width is an int or float > 0
+    #
+    # Attribute height: the height of the model
+    # Invariant: height is an int or float > 0
+    #
+    # Attribute _sprite: the drawable attached to this model
+    # Invariant: _sprite is a GObject, or None if the model was never drawn (or
+    # has no drawable)
+    #
+    # Attribute _lastX: the value of x at the last call to remember
+    # Invariant: _lastX is an int or float
+    #
+    # Attribute _lastY: the value of y at the last call to remember
+    # Invariant: _lastY is an int or float
+
+    def __init__(self, x, y, width, height):
+        """
+        Initializes a model centered at (x,y) with the given size
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self._sprite = None
+        self.remember()
+
+    def remember(self):
+        """
+        Stores the current position, so that draw can interpolate from it
+
+        Call this at the start of every simulation step.
+        """
+        self._lastX = self.x
+        self._lastY = self.y
+
+    def snapshot(self):
+        """
+        Returns the state of this model as a tuple (x, y, last x, last y)
+
+        The drawable is not part of the state.
+        """
+        return (self.x, self.y, self._lastX, self._lastY)
+
+    def restore(self, state):
+        """
+        Sets the state of this model from a tuple made by snapshot
+
+        The drawable (if any) is kept, and is moved on the next draw.
+
+        Parameter state: the state to restore
+        Precondition: state was made by snapshot on a model of the same class
+        """
+        self.x, self.y, self._lastX, self._lastY = state
+
+    def contains(self, point):
+        """
+        Returns True if this model contains the point
+
+        This is the same bounding box test as GObject.contains.
+
+        Parameter point: the point to check
+        Precondition: point is a pair of numbers
+        """
+        return (abs(point[0]-self.x) < self.width/2.0 and
+                abs(point[1]-self.y) < self.height/2.0)
+
+    def draw(self, view, alpha=1.0):
+        """
+        Draws this model in the given view, creating the drawable if necessary
+
+        The model is drawn alpha of the way from the position stored by the last
+        call to remember to its current position.
+
+        Parameter view: the view to draw to
+        Precondition: view is a GView
+
+        Parameter alpha: the interpolation fraction
+        Precondition: alpha is a float 0..1
+        """
+        if self._sprite is None:
+            self._sprite = self._makeSprite()
+            if self._sprite is None:
+                return
+        self._syncSprite(self._sprite, alpha)
+        self._sprite.draw(view)
+
+    def erase(self, view):
+        """
+        Removes this model from the given view (if it was ever drawn)
+
+        This is only needed when the view is retained (see GView.retained).
+
+        Parameter view: the view to remove this model from
+        Precondition: view is a GView
+        """
+        if self._sprite is not None:
+            self._sprite.erase(view)
+
+    def _makeSprite(self):
+        """
+        Returns a new drawable for this model, or None if it has none.
+
+        Subclasses override this; a plain Model is not drawn.
+        """
+        return None
+
+    def _syncSprite(self, sprite, alpha):
+        """
+        Copies the (interpolated) position of this model into its drawable
+        """
+        x = float(self._lastX + (self.x-self._lastX)*alpha)
+        y = float(self._lastY + (self.y-self._lastY)*alpha)
+        if sprite.x != x:
+            sprite.x = x
+        if sprite.y != y:
+            sprite.y = y
+
+
+class Filmstrip(Model):
+    """
+    A model that is drawn as a frame of a sprite filmstrip.
+    """
+    # Attribute frame: the current animation frame
+    # Invariant: frame is an int 0..count-1
+    #
+    # Attribute source: the filmstrip image file
+    # Invariant: source is a string naming a file in Images
+    #
+    # Attribute format: the filmstrip grid size (rows, columns)
+    # Invariant: format is a 2-element tuple of ints > 0
+
+    @property
+    def count(self):
+        """
+        The number of frames in this filmstrip
+        """
+        return self.format[0]*self.format[1]
+
+    def __init__(self, x, y, width, height, source, format):
+        """
+        Initializes a filmstrip model centered at (x,y), showing frame 0
+        """
+        super().__init__(x, y, width, height)
+        self.source = source
+        self.format = format
+        self.frame = 0
+
+    def snapshot(self):
+        """
+        Returns the state of this model as a tuple (x, y, last x, last y, frame)
+        """
+        return (self.x, self.y, self._lastX, self._lastY, self.frame)
+
+    def restore(self, state):
+        """
+        Sets the state of this model from a tuple made by snapshot
+
+        Parameter state: the state to restore
+        Precondition: state was made by snapshot on a model of the same class
+        """
+        self.x, self.y, self._lastX, self._lastY, self.frame = state
+
+    def _makeSprite(self):
+        """
+        Returns a new GSprite for this model
+        """
+        from game2d import GSprite
+        return GSprite(x = self.x, y = self.y, width = self.width, height = self.height,
+                       source = self.source, format = self.format, frame = self.frame)
+
+    def _syncSprite(self, sprite, alpha):
+        """
+        Copies the (interpolated) position and frame of this model into its drawable
+        """
+        super()._syncSprite(sprite, alpha)
+        if sprite.frame != self.frame:
+            sprite.frame = self.frame
+
+
+class Ship(Filmstrip):
     """
     A class to represent the game ship.
 
@@ -54,7 +257,7 @@ class Ship(GSprite):
     keep this straight is for this class to have its own collision method.
 
     However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
+    inherited by Filmstrip. You would only add attributes if you needed them
     for extra gameplay features (like animation).
     """
     #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
@@ -72,8 +275,8 @@ class Ship(GSprite):
         """
         Initializes a new ship
         """
-        super().__init__(x = (GAME_WIDTH/2), y = SHIP_BOTTOM, width = SHIP_WIDTH, height = SHIP_HEIGHT,
-                        source = ALT_SHIP_IMAGE, format=(2,4), frame = 0)
+        super().__init__((GAME_WIDTH/2), SHIP_BOTTOM, SHIP_WIDTH, SHIP_HEIGHT,
+                         ALT_SHIP_IMAGE, (2,4))
 
     # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
     def moveShip(self, input):
@@ -85,16 +288,15 @@ class Ship(GSprite):
         if input.is_key_down('right'):
             self.x += SHIP_MOVEMENT
 
-        #find bounds
+        #find bounds (the smallest and largest values of range(left, right))
         left = int(SHIP_WIDTH/2)
-        right = int(GAME_WIDTH-(SHIP_WIDTH/2))
-        limit = range(left, right)
+        right = int(GAME_WIDTH-(SHIP_WIDTH/2)) - 1
 
         #set bounds on ship
-        if self.x >= max(limit):
-            self.x = max(limit)
-        elif self.x <= min(limit):
-            self.x = min(limit)
+        if self.x >= right:
+            self.x = right
+        elif self.x <= left:
+            self.x = left
 
     def collides(self,bolt):
         """
@@ -128,110 +330,268 @@ class Ship(GSprite):
         elif bolt.getVelocity() > 0:
             return False
 
-    # COROUTINE METHOD TO ANIMATE THE SHIP
-    def makeAnimator(self):
-        """
-        The animation coroutine.
+    # METHOD TO ANIMATE THE SHIP
+    def explode(self, time):
         """
-        timePast = 0
+        Shows the frame of the death animation, time seconds after the ship was hit
+
+        Returns False (leaving the frame alone) once the animation is over.  The
+        animation is driven by a plain number instead of a coroutine, so that a
+        dying ship can be saved and restored with the rest of the wave.
 
-        animating = True
-        while animating:
-            dt = (yield)
-            timePast += dt
-            x = timePast/DEATH_SPEED
-            x = x*7 + 1 #number of explosion images
-            x = round(x)
-            self.frame = x
+        Parameter time: the number of seconds since the ship was hit
+        Precondition: time is a number >= 0
+        """
+        x = time/DEATH_SPEED
+        x = x*7 + 1 #number of explosion images
+        x = round(x)
 
-            if timePast >= DEATH_SPEED:
-                animating = False
+        #stop once we run out of explosion images
+        if x >= self.count or time >= DEATH_SPEED:
+            return False
+        self.frame = x
+        return True
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
 
-class Alien(GSprite):
+class Formation(object):
     """
-    A class to represent a single alien.
+    A class to represent the whole formation of aliens.
 
-    At the very least, you want a __init__ method to initialize the alien
-    dimensions. These dimensions are all specified in consts.py.
+    The aliens are stored as a structure of arrays rather than a 2d list of
+    sprites.  Each attribute below is a NumPy array with one entry per cell of
+    the alien grid, so marching the aliens, walking them and checking the edges
+    are each a single vectorized operation, no matter the size of the grid.
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
+    Cells are indexed by (row, col), where row 0 is the top row and col 0 is
+    the left-most column.  A cell whose alien was destroyed stays in the grid
+    (and keeps marching with it), but it is no longer alive.
 
-    However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
-    for extra gameplay features (like giving each alien a score value).
+    The formation is only turned into sprites when it is drawn.  The rows that
+    share an image are drawn by one GSpriteBatch (a single mesh), which is made
+    the first time the formation is drawn and kept in sync with the arrays on
+    every draw after that.
     """
-    #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
-    pass
+    # Attribute rows: the number of rows of aliens
+    # Invariant: rows is an int > 0
+    #
+    # Attribute cols: the number of aliens in each row
+    # Invariant: cols is an int > 0
+    #
+    # Attribute x: the horizontal coordinate of each alien center
+    # Invariant: x is a (rows, cols) float array
+    #
+    # Attribute y: the vertical coordinate of each alien center
+    # Invariant: y is a (rows, cols) float array
+    #
+    # Attribute alive: whether or not the alien in each cell is alive
+    # Invariant: alive is a (rows, cols) bool array.  It should only be changed
+    # with the method kill, so that the column index below stays correct.
+    #
+    # Attribute frame: the animation frame of each alien
+    # Invariant: frame is a (rows, cols) int array with values 0..7
+    #
+    # Attribute kind: the image (index into ALT_ALIEN_IMAGES) of each row
+    # Invariant: kind is a (rows,) int array with values 0..2
+    #
+    # Attribute _batches: the sprite batch used to draw the rows of each image
+    # Invariant: _batches is a list of (rows, GSpriteBatch) pairs, where rows is an
+    # int array of the rows with that image, or None if the formation was never drawn
+    #
+    # Attribute _colCount: the number of live aliens in each column
+    # Invariant: _colCount is a (cols,) int array, equal to alive.sum(axis=0)
+    #
+    # Attribute _bottom: the row of the bottom most live alien in each column
+    # Invariant: _bottom is a (cols,) int array, -1 for an empty column
+    #
+    # Attribute _liveCols: the columns that have a live alien, in order
+    # Invariant: _liveCols is a sorted list of ints, the nonzero columns of _colCount
+    #
+    # Attribute _count: the number of live aliens
+    # Invariant: _count is an int >= 0, equal to alive.sum()
+    #
+    # Attribute _rowCount: the number of live aliens in each row
+    # Invariant: _rowCount is a (rows,) int array, equal to alive.sum(axis=1)
+    #
+    # Attribute _lowest: the y-coordinate of the bottom of the lowest live alien
+    # Invariant: _lowest is a float, or None if _count is 0
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
-    def getX(self):
-        return self.x
-
-    def setX(self, x):
-        self.x = x
+    def getX(self, row, col):
+        return float(self.x[row, col])
 
-    def getY(self):
-        return self.y
+    def getY(self, row, col):
+        return float(self.y[row, col])
 
-    def setY(self, y):
-        self.y = y
+    def isAlive(self, row, col):
+        return bool(self.alive[row, col])
 
-    def setFrame(self, frame):
-        self.frame = frame
+    def setFrame(self, row, col, frame):
+        self.frame[row, col] = frame
 
-    # INITIALIZER TO CREATE AN ALIEN
-    def __init__(self, x, y, fileNum):
+    # INITIALIZER TO CREATE THE FORMATION
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW, state=None):
         """
-        Initializes an alien of the given image source at (x,y)
+        Initializes a full grid of live aliens, with the top row ALIEN_CEILING
+        from the top of the window and the left column ALIEN_H_SEP from the
+        left edge.  Every two rows share an image, cycling through the
+        images in ALT_ALIEN_IMAGES.
+
+        If state is given, the formation is a copy of the one in the snapshot
+        instead (and rows and cols are ignored).
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+
+        Parameter state: the snapshot to copy, or None for a full grid
+        Precondition: state is None or a tuple made by snapshot
         """
-        super().__init__(x = x, y = y, width = ALIEN_WIDTH, height = ALIEN_HEIGHT,
-                        source = ALT_ALIEN_IMAGES[fileNum], format=(4,2), frame = 0)
+        if state is not None:
+            self.rows = 0
+            self.cols = 0
+            self.restore(state)
+            return
+
+        self.rows = rows
+        self.cols = cols
+
+        left = ALIEN_H_SEP + (ALIEN_WIDTH/2)
+        top = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT/2)
+        xs = left + np.arange(cols)*(ALIEN_WIDTH + ALIEN_H_SEP)
+        ys = top - np.arange(rows)*(ALIEN_HEIGHT + ALIEN_V_SEP)
+
+        self.x = np.tile(xs.astype(float), (rows, 1))
+        self.y = np.tile(ys.astype(float)[:, None], (1, cols))
+        self.alive = np.ones((rows, cols), dtype=bool)
+        self.frame = np.zeros((rows, cols), dtype=int)
+        self.kind = (np.arange(rows)//2) % len(ALT_ALIEN_IMAGES)
+        self._batches = None
+        self._reindex()
 
     # METHOD TO CHECK FOR COLLISION (IF DESIRED)
-    def collides(self,bolt):
+    def collides(self, row, col, bolt):
         """
-        Returns True if the player bolt collides with this alien
+        Returns True if the player bolt collides with the alien at (row, col)
 
-        This method returns False if bolt was not fired by the player.
+        This method returns False if bolt was not fired by the player, or if
+        the alien is not alive.
+
+        Parameter row: the row of the alien
+        Precondition: row is an int 0..rows-1
+
+        Parameter col: the column of the alien
+        Precondition: col is an int 0..cols-1
 
         Parameter bolt: The laser bolt to check
         Precondition: bolt is of class Bolt
         """
-        #get coordinates of bolt    #use getters
+        if not self.alive[row, col] or not bolt.isPlayerBolt():
+            return False
+
+        #get coordinates of bolt
         y1 = bolt.y + BOLT_HEIGHT/2
         y2 = bolt.y - BOLT_HEIGHT/2
         x1 = bolt.x - BOLT_WIDTH/2
         x2 = bolt.x + BOLT_WIDTH/2
 
-        #first check if the bolt is coming from the player
-        if bolt.getVelocity() > 0:
-            #then return True if any bolt coordinate is in the alien
-            if self.contains((x1,y1)) == True:
-                return True
-            elif self.contains((x2,y1)) == True:
-                return True
-            elif self.contains((x2,y2)) == True:
-                return True
-            elif self.contains((x1,y2)) == True:
-                return True
-            else:
-                return False
-        #return false if Bolt was fired by alien
-        elif bolt.getVelocity() < 0:
-            return False
+        #return True if any bolt coordinate is in the alien
+        dx = ALIEN_WIDTH/2.0
+        dy = ALIEN_HEIGHT/2.0
+        x = self.x[row, col]
+        y = self.y[row, col]
+        inX = abs(x1-x) < dx or abs(x2-x) < dx
+        inY = abs(y1-y) < dy or abs(y2-y) < dy
+        return bool(inX and inY)
+
+    def hits(self, bolts):
+        """
+        Returns a list of (bolt, row, col) for each player bolt that hits a live alien
+
+        This method tests all of the bolts against the whole formation at once.
+        As every cell of the formation marches together, the grid is regular.
+        So each corner of a bolt can only be inside of the cell whose center is
+        nearest to it, and that cell can be computed directly from the corner.
+        That makes the cost proportional to the number of bolts, not the size
+        of the formation.
+
+        The result agrees exactly with calling collides on every cell.  If a bolt
+        hits more than one alien, it is paired with the first one in the grid
+        (top to bottom, left to right).  The list is sorted in the same order.
+
+        Parameter bolts: The laser bolts to check
+        Precondition: bolts is a list of Bolt objects
+        """
+        bolts = [bolt for bolt in bolts if bolt.isPlayerBolt()]
+        if bolts == []:
+            return []
+        if len(bolts) == 1:
+            #the usual case (the ship has one bolt at a time) is faster without arrays
+            cell = self._hitCell(bolts[0])
+            return [] if cell is None else [(bolts[0],) + cell]
+
+        #the four corners of every bolt, as (len(bolts), 4) arrays
+        bx = np.array([bolt.x for bolt in bolts], dtype=float)[:, None]
+        by = np.array([bolt.y for bolt in bolts], dtype=float)[:, None]
+        px = bx + np.array([-1, 1, 1, -1])*(BOLT_WIDTH/2)
+        py = by + np.array([1, 1, -1, -1])*(BOLT_HEIGHT/2)
+
+        #the nearest cell to each corner
+        col = np.rint((px - self.x[0, 0])/(ALIEN_WIDTH + ALIEN_H_SEP)).astype(int)
+        row = np.rint((self.y[0, 0] - py)/(ALIEN_HEIGHT + ALIEN_V_SEP)).astype(int)
+        inside = (row >= 0) & (row < self.rows) & (col >= 0) & (col < self.cols)
+        row = np.where(inside, row, 0)
+        col = np.where(inside, col, 0)
+
+        #the same bounding box test as GObject.contains
+        inside &= self.alive[row, col]
+        inside &= np.abs(px - self.x[row, col]) < ALIEN_WIDTH/2.0
+        inside &= np.abs(py - self.y[row, col]) < ALIEN_HEIGHT/2.0
+
+        #pair each bolt with the first cell hit by any of its corners
+        cell = np.where(inside, row*self.cols + col, self.rows*self.cols).min(axis=1)
+        result = []
+        for index in np.argsort(cell, kind='stable'):
+            if cell[index] < self.rows*self.cols:
+                r, c = divmod(int(cell[index]), self.cols)
+                result.append((bolts[index], r, c))
+        return result
+
+    def _hitCell(self, bolt):
+        """
+        Returns the (row, col) of the first live alien hit by bolt, or None
+
+        This is the same test as hits, for a single bolt, using plain floats.
+
+        Parameter bolt: The player laser bolt to check
+        Precondition: bolt is a Bolt fired by the player
+        """
+        x0 = float(self.x[0, 0])
+        y0 = float(self.y[0, 0])
+        best = None
+        for dx, dy in ((-1, 1), (1, 1), (1, -1), (-1, -1)):
+            px = bolt.x + dx*(BOLT_WIDTH/2)
+            py = bolt.y + dy*(BOLT_HEIGHT/2)
+            col = round((px - x0)/(ALIEN_WIDTH + ALIEN_H_SEP))
+            row = round((y0 - py)/(ALIEN_HEIGHT + ALIEN_V_SEP))
+            if (0 <= row < self.rows and 0 <= col < self.cols and self.alive[row, col]
+                and abs(px - self.x[row, col]) < ALIEN_WIDTH/2.0
+                and abs(py - self.y[row, col]) < ALIEN_HEIGHT/2.0):
+                if best is None or (row, col) < best:
+                    best = (row, col)
+        return best
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
-    def moveAlienAcross(self, direction):
+    def moveAcross(self, direction):
         """
-        Helper method that moves the aliens left and right, or away from edge
+        Moves the whole formation left and right, or away from edge
+
+        Parameter direction: the direction to move
+        Precondition: direction is one of "left", "right", "switchLeft" or
+        "switchRight"
         """
         # move left or right
         if direction == "right":
@@ -245,40 +605,233 @@ class Alien(GSprite):
         elif direction == "switchRight":
             self.x += (ALIEN_WIDTH/2)
 
-    def moveAlienDown(self, direction):
+    def moveDown(self):
         """
-        Helper method that moves an aliens down
+        Moves the whole formation down
         """
         self.y -= ALIEN_V_WALK
+        if self._lowest is not None:
+            self._lowest -= ALIEN_V_WALK
+
+    def walk(self):
+        """
+        Switches every live alien between frames 0 and 1.  Aliens showing any
+        other frame (because they are exploding) are left alone.
+        """
+        walking = self.alive & (self.frame <= 1)
+        self.frame[walking] = 1 - self.frame[walking]
+
+    def atEdge(self, direction):
+        """
+        Returns True if a live alien is at the edge in the given direction
+
+        Parameter direction: the direction the formation is moving
+        Precondition: direction is a string
+        """
+        if direction == "right":
+            return bool(np.any(self.x[self.alive] + (ALIEN_WIDTH/2) >= GAME_WIDTH - ALIEN_H_SEP))
+        elif direction == "left":
+            return bool(np.any(self.x[self.alive] - (ALIEN_WIDTH/2) < ALIEN_H_SEP))
+        return False
+
+    def liveColumns(self):
+        """
+        Returns the sorted list of the indices of the columns that have a live alien.
+
+        This list is maintained as aliens are killed, so this method takes
+        constant time.  The list belongs to the formation and must not be
+        modified.
+        """
+        return self._liveCols
+
+    def bottomRow(self, col):
+        """
+        Returns the row of the bottom most live alien in the given column
+
+        This value is maintained as aliens are killed, so this method takes
+        constant time.
+
+        Parameter col: the index of a nonempty column
+        Precondition: col is an int 0..cols-1
+        """
+        return int(self._bottom[col])
+
+    def allDead(self):
+        """
+        Returns True if every alien in the formation is dead
+
+        This method takes constant time.
+        """
+        return self._count == 0
+
+    def lowestY(self):
+        """
+        Returns the lowest y-coordinate of the bottom of any live alien, or None
+        if all the aliens are dead
+
+        This value is maintained as aliens are killed or step down, so this
+        method takes constant time.
+        """
+        return self._lowest
+
+    def kill(self, row, col):
+        """
+        Removes the alien at (row, col) from the formation
+
+        Parameter row: the row of the alien
+        Precondition: row is an int 0..rows-1
+
+        Parameter col: the column of the alien
+        Precondition: col is an int 0..cols-1
+        """
+        if not self.alive[row, col]:
+            return
+
+        self.alive[row, col] = False
+        self._count -= 1
+        self._rowCount[row] -= 1
+        if self._rowCount[row] == 0:
+            self._findLowest()
+
+        self._colCount[col] -= 1
+        if self._colCount[col] == 0:
+            self._bottom[col] = -1
+            self._liveCols.remove(col)
+        elif self._bottom[col] == row:
+            self._bottom[col] = np.flatnonzero(self.alive[:, col])[-1]
+
+    def snapshot(self):
+        """
+        Returns the state of this formation as a tuple
+
+        The tuple holds read-only copies of the arrays x, y, alive and frame,
+        followed by the column and row indexes, so restoring it does not need
+        to rebuild them.  The sprite batches are not part of the state.
+        """
+        arrays = []
+        for array in (self.x, self.y, self.alive, self.frame,
+                      self._colCount, self._bottom, self._rowCount):
+            array = array.copy()
+            array.flags.writeable = False
+            arrays.append(array)
+        return tuple(arrays) + (tuple(self._liveCols), self._count, self._lowest)
+
+    def restore(self, state):
+        """
+        Sets the state of this formation from a tuple made by snapshot
+
+        The sprite batches are kept if the snapshot has the same size as this
+        formation, and are moved on the next draw.
+
+        Parameter state: the state to restore
+        Precondition: state was made by snapshot on a Formation
+        """
+        x, y, alive, frame, colCount, bottom, rowCount, liveCols, count, lowest = state
+        if x.shape != (self.rows, self.cols):
+            self.rows, self.cols = x.shape
+            self.kind = (np.arange(self.rows)//2) % len(ALT_ALIEN_IMAGES)
+            self._batches = None
+
+        self.x = x.copy()
+        self.y = y.copy()
+        self.alive = alive.copy()
+        self.frame = frame.copy()
+        self._colCount = colCount.copy()
+        self._bottom = bottom.copy()
+        self._rowCount = rowCount.copy()
+        self._liveCols = list(liveCols)
+        self._count = count
+        self._lowest = lowest
+
+    def _reindex(self):
+        """
+        Rebuilds the column index from the array alive
+        """
+        self._colCount = self.alive.sum(axis=0)
+        self._bottom = np.where(self._colCount > 0,
+                                self.rows - 1 - np.argmax(self.alive[::-1], axis=0), -1)
+        self._liveCols = [int(c) for c in np.flatnonzero(self._colCount)]
+
+        self._count = int(self.alive.sum())
+        self._rowCount = self.alive.sum(axis=1)
+        self._findLowest()
 
-        #make sure u change it so u acess x and y of alien with getter
-    def makeAnimator(self, alien):
+    def _findLowest(self):
         """
-        The animation coroutine.
+        Recomputes the bottom of the lowest live alien from the row counts
         """
-        timePast = 0
+        rows = np.flatnonzero(self._rowCount)
+        if len(rows) == 0:
+            self._lowest = None
+        else:
+            self._lowest = float(self.y[rows[-1], 0]) - ALIEN_HEIGHT/2
+
+    def explode(self, row, col, time):
+        """
+        Shows the frame of the death animation of the alien at (row, col), time
+        seconds after it was hit
+
+        Returns False once the animation is over (after showing the last frame).
+
+        Parameter row: the row of the alien
+        Precondition: row is an int 0..rows-1
+
+        Parameter col: the column of the alien
+        Precondition: col is an int 0..cols-1
+
+        Parameter time: the number of seconds since the alien was hit
+        Precondition: time is a number >= 0
+        """
+        x = time/DEATH_SPEED
+        x = x*3 #number of explosion images
+        x = round(x)
+        self.frame[row, col] = x
+        return time < DEATH_SPEED
+
+    def draw(self, view):
+        """
+        Draws every live alien in the given view
+
+        Parameter view: the view to draw to
+        Precondition: view is a GView
+        """
+        if self._batches is None:
+            from game2d import GSpriteBatch
+            self._batches = []
+            for kind in range(len(ALT_ALIEN_IMAGES)):
+                rows = np.flatnonzero(self.kind == kind)
+                if len(rows) > 0:
+                    batch = GSpriteBatch(source = ALT_ALIEN_IMAGES[kind], format = (4,2),
+                                         width = ALIEN_WIDTH, height = ALIEN_HEIGHT,
+                                         capacity = len(rows)*self.cols)
+                    self._batches.append((rows, batch))
+
+        for rows, batch in self._batches:
+            batch.place(self.x[rows], self.y[rows], self.frame[rows], self.alive[rows])
+            batch.draw(view)
+
+    def erase(self, view):
+        """
+        Removes every alien from the given view (if they were ever drawn)
 
-        animating = True
-        while animating:
-            dt = (yield)
-            timePast += dt
-            x = timePast/DEATH_SPEED
-            x = x*3 #number of explosion images
-            x = round(x)
-            self.frame = x
+        This is only needed when the view is retained (see GView.retained).
 
-            if timePast >= DEATH_SPEED:
-                animating = False
+        Parameter view: the view to remove the aliens from
+        Precondition: view is a GView
+        """
+        if self._batches is not None:
+            for rows, batch in self._batches:
+                batch.erase(view)
 
 
-class Bolt(GRectangle):
+class Bolt(Model):
     """
     A class representing a laser bolt.
 
     Laser bolts are often just thin, white rectangles. The size of the bolt
-    is determined by constants in consts.py. We MUST subclass GRectangle,
-    because we need to add an extra (hidden) attribute for the velocity of
-    the bolt.
+    is determined by constants in consts.py. It is drawn as a GRectangle,
+    but we need a model class because we need to add an extra (hidden)
+    attribute for the velocity of the bolt.
 
     The class Wave will need to look at these attributes, so you will need
     getters for them.  However, it is possible to write this assignment with
@@ -287,7 +840,7 @@ class Bolt(GRectangle):
 
     In addition to the getters, you need to write the __init__ method to set
     the starting velocity. This __init__ method will need to call the __init__
-    from GRectangle as a  helper.
+    from Model as a  helper.
 
     You also MIGHT want to create a method to move the bolt.  You move the
     bolt by adding the velocity to the y-position.  However, the getter
@@ -318,11 +871,33 @@ class Bolt(GRectangle):
         """
         Initializes the creation of a bolt
         """
-        GRectangle.__init__(self, x = x, y = y, width = BOLT_WIDTH, height = BOLT_HEIGHT,
-                        fillcolor = "black", linecolor = "black")
+        Model.__init__(self, x, y, BOLT_WIDTH, BOLT_HEIGHT)
 
         self._velocity = velocity
 
+    def snapshot(self):
+        """
+        Returns the state of this bolt as a tuple (x, y, last x, last y, velocity)
+        """
+        return (self.x, self.y, self._lastX, self._lastY, self._velocity)
+
+    def restore(self, state):
+        """
+        Sets the state of this bolt from a tuple made by snapshot
+
+        Parameter state: the state to restore
+        Precondition: state was made by snapshot on a Bolt
+        """
+        self.x, self.y, self._lastX, self._lastY, self._velocity = state
+
+    def _makeSprite(self):
+        """
+        Returns a new GRectangle for this bolt
+        """
+        from game2d import GRectangle
+        return GRectangle(x = self.x, y = self.y, width = self.width, height = self.height,
+                          fillcolor = "black", linecolor = "black")
+
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
     def isPlayerBolt(self):
         """
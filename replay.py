@@ -0,0 +1,380 @@
+"""
+Replay module for Alien Invaders
+
+This module records the input consumed by a game, and plays it back headless.
+A wave only depends on its seed, its size and the keys it is given, so a
+recording of the keys held down at each update is enough to play exactly the
+same game again.  This can be used to check a reported high score, or to
+reproduce a problem from a game played by somebody else.
+
+A recording has one 16-bit code for each update of Invaders while the wave
+exists.  The low five bits of the code are the keys in REPLAY_KEYS that were
+held down, the next five are the keys that were pressed since the last update
+(see GInput.was_key_pressed), and the two high bits say whether the wave was
+updated, or given a new ship, in that update.  The codes are compressed with
+zlib (they are mostly runs of the same value), and follow a short header with
+the seed and size of the wave.
+
+Playing back a recording does not need Kivy, and runs as fast as the wave
+can be updated.
+"""
+from consts import *
+from headless import HeadlessInput
+from wave import Wave
+import array
+import struct
+import sys
+import zlib
+
+# The keys stored in each code of a recording, from the lowest bit up
+REPLAY_KEYS = ('left', 'right', 'spacebar', 'm', 'escape')
+
+# The mask of the held keys in a code (the pressed keys are the next bits up)
+_HELD    = 0x1F
+_PRESSED = 5
+# The bit set when Wave.update was called in an update
+_UPDATE = 0x8000
+# The bit set when Wave.createShip was called in an update
+_SHIP   = 0x4000
+
+# The header of a replay file (see Replay.save)
+_MAGIC  = b'AIRP'
+_VERSION = 2
+_HEADER = struct.Struct('<4sBBBHQddqbI')
+
+# The outcome codes stored in a file (see OUTCOME_WIN in consts.py)
+_OUTCOMES = {None: OUTCOME_NONE, 'win': OUTCOME_WIN, 'lose': OUTCOME_LOSE}
+
+# The keys for every value of five key bits, so each update is a lookup
+_KEYS = [tuple(key for bit, key in enumerate(REPLAY_KEYS) if code >> bit & 1)
+         for code in range(_HELD+1)]
+
+
+class Replay(object):
+    """
+    A class representing a recorded game.
+
+    A replay is either made by a Recorder or loaded from a file with load.
+    Calling play runs the game again, headless, and returns the finished wave.
+    The score and outcome recorded with the game are kept, so that they can
+    be compared with the result of play.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _seed: the seed of the wave
+    # Invariant: _seed is an int >= 0
+    #
+    # Attribute _rows, _cols: the size of the wave
+    # Invariant: _rows, _cols are ints 1..255
+    #
+    # Attribute _batch: the batch argument of the wave
+    # Invariant: _batch is an int >= 0
+    #
+    # Attribute _dt: the number of seconds in a single update
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _speed: the value of ALIEN_SPEED when the game was played
+    # Invariant: _speed is a float >= 0
+    #
+    # Attribute _score: the score recorded with the game
+    # Invariant: _score is an int >= 0
+    #
+    # Attribute _outcome: the outcome recorded with the game
+    # Invariant: _outcome is one of the OUTCOME constants
+    #
+    # Attribute _codes: the recorded code for each update
+    # Invariant: _codes is an array of type 'H' (unsigned 16-bit ints)
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def seed(self):
+        """
+        The seed of the recorded wave
+        """
+        return self._seed
+
+    @property
+    def rows(self):
+        """
+        The number of rows of aliens in the recorded wave
+        """
+        return self._rows
+
+    @property
+    def cols(self):
+        """
+        The number of aliens in each row of the recorded wave
+        """
+        return self._cols
+
+    @property
+    def dt(self):
+        """
+        The number of seconds in a single update
+        """
+        return self._dt
+
+    @property
+    def score(self):
+        """
+        The score recorded with the game
+        """
+        return self._score
+
+    @property
+    def outcome(self):
+        """
+        The outcome recorded with the game (one of the OUTCOME constants)
+        """
+        return self._outcome
+
+    @property
+    def ticks(self):
+        """
+        The number of recorded updates
+        """
+        return len(self._codes)
+
+    # INITIALIZER
+    def __init__(self, seed, rows, cols, batch, dt, codes=(), score=0,
+                 outcome=OUTCOME_NONE, speed=None):
+        """
+        Initializes a replay of a wave
+
+        Parameter seed: the seed of the wave
+        Precondition: seed is an int >= 0
+
+        Parameter rows, cols: the size of the wave
+        Precondition: rows, cols are ints 1..255
+
+        Parameter batch: the batch argument of the wave
+        Precondition: batch is an int 0..65535
+
+        Parameter dt: the number of seconds in a single update
+        Precondition: dt is a float > 0
+
+        Parameter codes: the recorded code for each update
+        Precondition: codes is a sequence of ints 0..65535
+
+        Parameter score: the score recorded with the game
+        Precondition: score is an int >= 0
+
+        Parameter outcome: the outcome recorded with the game
+        Precondition: outcome is one of the OUTCOME constants
+
+        Parameter speed: the value of ALIEN_SPEED, or None for the current value
+        Precondition: speed is None or a float >= 0
+        """
+        self._seed = seed
+        self._rows = rows
+        self._cols = cols
+        self._batch = batch
+        self._dt = dt
+        self._codes = array.array('H', codes)
+        self._score = score
+        self._outcome = outcome
+        self._speed = ALIEN_SPEED if speed is None else speed
+
+    def play(self, limit=None):
+        """
+        Returns the wave after playing back the recording headless
+
+        The wave is updated (and given new ships) exactly as it was when the
+        game was recorded.  This raises a ValueError if the game was played
+        with a different value of ALIEN_SPEED, as it would not be the same game.
+
+        Parameter limit: the most updates to play, or None to play them all
+        Precondition: limit is None or an int >= 0
+        """
+        wave = self._makeWave()
+        codes = self._codes if limit is None else self._codes[:limit]
+        for tick in self._playback(wave, codes):
+            pass
+        return wave
+
+    def verify(self):
+        """
+        Returns (score, outcome, divergence) after playing back the recording
+
+        The divergence is -1 if the playback matches the recording.  Otherwise
+        it is the index of the first update that shows the recording is wrong,
+        and the playback stops there: the update where the wave was over before
+        the recording was, the update where the score went past the recorded
+        score, or the last update if the playback ended with a different score
+        or outcome than the one recorded.  The score and outcome (one of the
+        OUTCOME constants) are those of the playback when it stopped.
+
+        This raises a ValueError under the same conditions as play.
+        """
+        wave = self._makeWave()
+        # The recording may end with codes that are not updates (a pause before the end)
+        last = len(self._codes)-1
+        while last >= 0 and not self._codes[last] & _UPDATE:
+            last -= 1
+        for tick in self._playback(wave, self._codes):
+            if wave.getScore() > self._score or (wave.getOutcome() is not None and tick < last):
+                return (wave.getScore(), _OUTCOMES[wave.getOutcome()], tick)
+
+        result = (wave.getScore(), _OUTCOMES[wave.getOutcome()])
+        return result + (-1 if result == (self._score, self._outcome) else max(last, 0),)
+
+    def save(self, filename):
+        """
+        Writes this replay to a file
+
+        Parameter filename: the name of the file to write
+        Precondition: filename is a string, naming a file in a folder that exists
+        """
+        header = _HEADER.pack(_MAGIC, _VERSION, self._rows, self._cols, self._batch,
+                              self._seed, self._dt, self._speed, self._score,
+                              self._outcome, len(self._codes))
+        codes = array.array('H', self._codes)
+        if sys.byteorder == 'big':
+            codes.byteswap()
+        with open(filename, 'wb') as file:
+            file.write(header)
+            file.write(zlib.compress(codes.tobytes(), 9))
+
+    def _playback(self, wave, codes):
+        """
+        Plays the codes on wave, yielding the index of each update of the wave
+
+        Parameter wave: the wave to play
+        Precondition: wave is a new Wave made by _makeWave
+
+        Parameter codes: the codes to play
+        Precondition: codes is a slice of _codes, starting at 0
+        """
+        # the keys held at the start were pressed before the recording began
+        input = HeadlessInput(*_KEYS[codes[0] & _HELD]) if len(codes) > 0 else HeadlessInput()
+        dt = self._dt
+        for tick, code in enumerate(codes):
+            input.press(*_KEYS[code & _HELD])
+            if code >> _PRESSED & _HELD:
+                input.tap(*_KEYS[code >> _PRESSED & _HELD])
+            if code & _SHIP:
+                wave.createShip()
+            if code & _UPDATE:
+                wave.update(input, dt)
+                yield tick
+
+    def _makeWave(self):
+        """
+        Returns a new wave with the seed and size of the recorded one
+
+        This raises a ValueError if the game was played with a different value
+        of ALIEN_SPEED, as it would not be the same game.
+        """
+        if self._speed != ALIEN_SPEED:
+            raise ValueError('the game was played with ALIEN_SPEED %s, not %s' %
+                             (self._speed, ALIEN_SPEED))
+        return Wave(self._rows, self._cols, self._seed, self._batch)
+
+
+class Recorder(object):
+    """
+    A class that records the input consumed by a wave.
+
+    The controller calls record once in every update, from the first update
+    after the wave is made until the game is over.  It tells the recorder
+    which keys were down and whether it updated the wave or gave it a new
+    ship.  For example, Invaders does this with
+
+        self._recorder.record(self.input, updated=True)
+
+    when the game is active.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the wave being recorded
+    # Invariant: _wave is a Wave object
+    #
+    # Attribute _dt: the number of seconds in a single update
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _codes: the recorded code for each update so far
+    # Invariant: _codes is an array of type 'H' (unsigned 16-bit ints)
+
+    @property
+    def ticks(self):
+        """
+        The number of updates recorded so far
+        """
+        return len(self._codes)
+
+    def __init__(self, wave, dt=1.0/TICK_RATE):
+        """
+        Initializes a recorder for a new wave (one that has not been updated)
+
+        Parameter wave: the wave to record
+        Precondition: wave is a Wave object that was never updated
+
+        Parameter dt: the number of seconds in a single update
+        Precondition: dt is a float > 0
+        """
+        self._wave = wave
+        self._dt = dt
+        self._codes = array.array('H')
+
+    def record(self, input, updated=False, created=False):
+        """
+        Records the keys held down in a single update
+
+        Parameter input: the input of this update
+        Precondition: input is a GInput (or HeadlessInput)
+
+        Parameter updated: whether the wave was updated with this input
+        Precondition: updated is a bool
+
+        Parameter created: whether the wave was given a new ship (before any update)
+        Precondition: created is a bool
+        """
+        code = 0
+        for bit, key in enumerate(REPLAY_KEYS):
+            if input.is_key_down(key):
+                code |= 1 << bit
+            if input.was_key_pressed(key):
+                code |= 1 << (bit+_PRESSED)
+        if updated:
+            code |= _UPDATE
+        if created:
+            code |= _SHIP
+        self._codes.append(code)
+
+    def replay(self):
+        """
+        Returns the Replay of the game recorded so far
+        """
+        wave = self._wave
+        return Replay(wave.getSeed(), wave.getAliens().rows, wave.getAliens().cols,
+                      wave.getBatch(), self._dt, self._codes, wave.getScore(),
+                      _OUTCOMES[wave.getOutcome()])
+
+
+def load(filename):
+    """
+    Returns the Replay stored in a file made by Replay.save
+
+    This raises a ValueError if the file is not a replay file.
+
+    Parameter filename: the name of the file to read
+    Precondition: filename is a string, naming a file that exists
+    """
+    with open(filename, 'rb') as file:
+        data = file.read()
+
+    if len(data) < _HEADER.size or data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError('%s is not a replay file' % repr(filename))
+    (magic, version, rows, cols, batch, seed, dt, speed,
+     score, outcome, ticks) = _HEADER.unpack_from(data)
+    if version != _VERSION:
+        raise ValueError('%s has unknown replay version %d' % (repr(filename), version))
+
+    codes = array.array('H')
+    try:
+        codes.frombytes(zlib.decompress(data[_HEADER.size:]))
+    except zlib.error:
+        raise ValueError('%s is corrupted' % repr(filename))
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    if len(codes) != ticks:
+        raise ValueError('%s is truncated' % repr(filename))
+    return Replay(seed, rows, cols, batch, dt, codes, score, outcome, speed)
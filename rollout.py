@@ -0,0 +1,126 @@
+"""
+Parallel rollout module for Alien Invaders
+
+This module plays many headless waves in worker processes, one wave for each
+seed in a range.  The results are written straight into a block of shared
+memory, so the only things sent between processes are the policy (once per
+worker) and the index of the next chunk of seeds to play.
+
+Workers take chunks of seeds from a shared counter until there are none left.
+A worker that is stuck on a long game simply takes fewer chunks, while the
+other workers carry on with the rest, so one long game never stalls the pool.
+
+The policy is sent to the workers by pickling, so it must be a function (or
+callable object) defined at the top level of a module.
+"""
+from consts import *
+from headless import simulate
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+import os
+
+# The rows of the shared results table
+_SEED    = 0
+_SCORE   = 1
+_TICKS   = 2
+_OUTCOME = 3
+
+
+def rollout(policy, seeds, processes=None, chunk=4, rows=ALIEN_ROWS,
+            cols=ALIENS_IN_ROW, dt=1.0/TICK_RATE, limit=None):
+    """
+    Returns (scores, ticks, outcomes) after playing one wave for each seed
+
+    Each result is an int64 NumPy array in the same order as seeds.  See the
+    function simulate in headless.py for the meaning of the values.
+
+    Parameter policy: the agent playing the games
+    Precondition: policy is a picklable function taking a Wave and returning
+    an index into ACTION_KEYS
+
+    Parameter seeds: the seeds of the waves to play
+    Precondition: seeds is a sequence (such as a range) of ints >= 0
+
+    Parameter processes: the number of worker processes, or None for one per CPU
+    Precondition: processes is None or an int > 0
+
+    Parameter chunk: the number of seeds a worker takes at a time
+    Precondition: chunk is an int > 0
+
+    Parameter rows, cols, dt, limit: the options for each game (see simulate)
+    Precondition: the same as for simulate
+    """
+    count = len(seeds)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, (count+chunk-1)//chunk))
+
+    memory = shared_memory.SharedMemory(create=True, size=max(1, 4*count*8))
+    try:
+        table = np.ndarray((4, count), dtype=np.int64, buffer=memory.buf)
+        table[_SEED] = np.asarray(seeds, dtype=np.int64)
+        table[_SCORE:] = 0
+
+        options = {'rows': rows, 'cols': cols, 'dt': dt, 'limit': limit}
+        counter = multiprocessing.Value('q', 0)
+        workers = [multiprocessing.Process(target=_work,
+                                           args=(memory.name, count, counter, chunk,
+                                                 policy, options))
+                   for x in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        failed = [worker.exitcode for worker in workers if worker.exitcode != 0]
+        if failed != []:
+            raise RuntimeError('%d rollout workers failed (exit codes %s)' %
+                               (len(failed), repr(failed)))
+
+        result = (table[_SCORE].copy(), table[_TICKS].copy(), table[_OUTCOME].copy())
+        del table
+        return result
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _work(name, count, counter, chunk, policy, options):
+    """
+    Plays chunks of games until none are left (the body of a worker process)
+
+    Parameter name: the name of the shared memory block with the results table
+    Precondition: name is a string
+
+    Parameter count: the number of games in the table
+    Precondition: count is an int >= 0
+
+    Parameter counter: the index of the next game to claim
+    Precondition: counter is a shared int (multiprocessing.Value)
+
+    Parameter chunk: the number of games to claim at a time
+    Precondition: chunk is an int > 0
+
+    Parameter policy: the agent playing the games
+    Precondition: policy is a function taking a Wave and returning an int
+
+    Parameter options: the keyword arguments for simulate
+    Precondition: options is a dictionary
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        table = np.ndarray((4, count), dtype=np.int64, buffer=memory.buf)
+        while True:
+            with counter.get_lock():
+                start = counter.value
+                counter.value = start+chunk
+            if start >= count:
+                break
+
+            for index in range(start, min(start+chunk, count)):
+                result = simulate(policy, int(table[_SEED, index]), **options)
+                table[_SCORE:, index] = result
+        del table
+    finally:
+        memory.close()
@@ -0,0 +1,107 @@
+"""
+The replay verification script for Alien Invaders
+
+This script checks every replay file (see replay.py) in a folder.  Each game
+is played back headless, with no drawing, and compared with the score and
+outcome recorded with it.  Games are only recorded if REPLAY_FOLDER is set in
+consts.py (for example, to 'Replays').  Run it from this folder with
+
+    python verify.py Replays
+
+To choose the number of worker processes (the default is one per CPU), use
+
+    python verify.py Replays --processes=4
+
+Each line of the report gives the file, the recorded score, the score and
+outcome of the playback, and the update where the playback diverged from the
+recording (or OK).  The script exits with status 1 if any replay is invalid.
+"""
+from consts import *
+import replay
+import multiprocessing
+import os
+import sys
+import time
+
+# The names of the outcome codes in the report
+_OUTCOME_NAMES = {OUTCOME_NONE: 'none', OUTCOME_WIN: 'win', OUTCOME_LOSE: 'lose'}
+
+
+def check(filename):
+    """
+    Returns (filename, recorded score, score, outcome, divergence, ticks, error)
+    after verifying the replay in the given file
+
+    The divergence is -1 if the replay is valid (see Replay.verify).  If the
+    file cannot be read or played back, error is the reason and the other
+    values are None.
+
+    Parameter filename: the replay file to check
+    Precondition: filename is a string, naming a file that exists
+    """
+    try:
+        game = replay.load(filename)
+        score, outcome, divergence = game.verify()
+        return (filename, game.score, score, outcome, divergence, game.ticks, None)
+    except (OSError, ValueError) as e:
+        return (filename, None, None, None, None, None, str(e))
+
+
+def main(folder, processes=None):
+    """
+    Verifies every replay file in folder, printing a report
+
+    Returns the number of invalid replays.
+
+    Parameter folder: the folder of replay files
+    Precondition: folder is a string, naming a folder that exists
+
+    Parameter processes: the number of worker processes, or None for one per CPU
+    Precondition: processes is None or an int > 0
+    """
+    files = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                   if name.endswith('.air'))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(files)))
+
+    start = time.perf_counter()
+    invalid = 0
+    ticks = 0
+    with multiprocessing.Pool(processes) as pool:
+        for result in pool.imap(check, files):
+            filename, recorded, score, outcome, divergence, length, error = result
+            name = os.path.basename(filename)
+            if error is not None:
+                invalid += 1
+                print('%s: ERROR %s' % (name, error))
+                continue
+
+            ticks += length
+            if divergence == -1:
+                status = 'OK'
+            else:
+                invalid += 1
+                status = 'DIVERGED at update %d' % divergence
+            print('%s: recorded %d, played %d (%s) %s' %
+                  (name, recorded, score, _OUTCOME_NAMES[outcome], status))
+
+    elapsed = time.perf_counter() - start
+    print('%d of %d replays valid, %d updates in %.1f seconds (%.0f updates per second)' %
+          (len(files)-invalid, len(files), ticks, elapsed, ticks/max(elapsed, 1e-9)))
+    return invalid
+
+
+if __name__ == '__main__':
+    processes = None
+    arguments = []
+    for argument in sys.argv[1:]:
+        if argument.startswith('--processes='):
+            processes = int(argument[len('--processes='):])
+        else:
+            arguments.append(argument)
+
+    if len(arguments) != 1:
+        print('Usage: python verify.py FOLDER [--processes=N]')
+        sys.exit(2)
+    sys.exit(1 if main(arguments[0], processes) > 0 else 0)
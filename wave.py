@@ -16,15 +16,29 @@ answer.
 # YOUR NAME(S) AND NETID(S) HERE
 # DATE COMPLETED HERE
 """
-from game2d import *
 from consts import *
 from models import *
 import random
+import collections
+import numpy as np
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
 # permitted to access anything in their parent. To see why, take CS 3152)
 
+# HEADLESS RULE: Wave never imports game2d at the top level.  The defensive line
+# and the sounds are only created the first time the wave is drawn to a GView.
+# Until then, a wave is pure game state and can be simulated without Kivy.
+
+# The gameplay state of a wave, as made by Wave.snapshot.  The fields are the
+# hidden attributes of Wave without the underscore, except that random and rng
+# are the states of the random generators, aliens is a Formation snapshot, ship
+# is a Ship snapshot (or None) and bolts is a tuple of Bolt snapshots.
+WaveState = collections.namedtuple('WaveState',
+    ['seed', 'batch', 'random', 'rng', 'rates', 'picks', 'nextRate', 'nextPick',
+     'aliens', 'ship', 'bolts', 'lives', 'time', 'direction', 'boltSpeed', 'steps',
+     'shipTime', 'alienTime', 'index1', 'index2', 'outcome', 'score', 'mute'])
+
 
 class Wave(object):
     """
@@ -54,14 +68,17 @@ class Wave(object):
     # Attribute _ship: the player ship to control
     # Invariant: _ship is a Ship object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _aliens: the formation of aliens in the wave
+    # Invariant: _aliens is a Formation object
     #
     # Attribute _bolts: the laser bolts currently on screen
     # Invariant: _bolts is a list of Bolt objects, possibly empty
     #
     # Attribute _dline: the defensive line being protected
-    # Invariant : _dline is a GPath object
+    # Invariant : _dline is a GPath object, or None if the wave was never drawn
+    #
+    # Attribute _drawn: the ship and bolts drawn in the last call to draw
+    # Invariant: _drawn is a list of Ship and Bolt objects, possibly empty
     #
     # Attribute _lives: the number of lives left
     # Invariant: _lives is an int >= 0
@@ -76,20 +93,17 @@ class Wave(object):
     # Attribute _direction: the current direction the aliens should move in
     # Invariant: _direction is a string of "left" or "right"
 
-    #Attribute _lastSpace: stores whether or not the space bar was pressed last frame
-    #Invariant: _lastSpace is a bool
-
     #Attribute _boltSpeed: the number of steps until the aliens must fire
     #Invariant: _boltSpeed a float >= 0
 
     #Attribute _steps: the number of steps taken by the aliens
     #Invariant: _steps a float >= 0
 
-    # Attribute _animator: The animation coroutine for the ship.
-    # Invariant: _animator is either None or a coroutine
+    # Attribute _shipTime: the seconds since the ship was hit (for its death animation)
+    # Invariant: _shipTime is either None (no animation) or a float >= 0
 
-    # Attribute _alienAnimator: The animation coroutine for Aliens.
-    # Invariant: _alienAnimator is either None or a coroutine
+    # Attribute _alienTime: the seconds since the alien at (_index1, _index2) was hit
+    # Invariant: _alienTime is either None (no animation) or a float >= 0
 
     # Attribute _index1: the row of the alien currently hit by a bolt.
     # Invariant: _index1 is an int >= 0
@@ -104,10 +118,43 @@ class Wave(object):
     # Invariant: _mute is an int >=0
 
     # Attribute _sounds: the list of sounds used in the game
-    # Invariant: _sounds is a list of Sound objects
+    # Invariant: _sounds is a list of Sound and SoundPool objects, or None if the wave was never
+    # drawn (in which case the wave is headless and plays no sounds)
+
+    # Attribute _score: the number of points scored (ALIEN_POINTS per alien destroyed)
+    # Invariant: _score is an int >= 0
+
+    # Attribute _seed: the seed for the random choices made by this wave
+    # Invariant: _seed is an int >= 0
+
+    # Attribute _random: the random generator for this wave (when not batched)
+    # Invariant: _random is a random.Random object, or None if _batch > 0
+
+    # Attribute _batch: the number of firing decisions drawn at a time
+    # Invariant: _batch is an int >= 0 (0 means draw them one at a time)
+
+    # Attribute _rng: the NumPy generator for batched firing decisions
+    # Invariant: _rng is a numpy Generator, or None if _batch is 0
+
+    # Attribute _rates: the batch of pre-drawn values for _boltSpeed
+    # Invariant: _rates is a (_batch,) int array, or None.  It is replaced, never
+    # modified, so that snapshots can share it.
+
+    # Attribute _picks: the batch of pre-drawn column choices, as fractions
+    # Invariant: _picks is a (_batch,) float array in [0,1), or None.  It is
+    # replaced, never modified, so that snapshots can share it.
 
-    #Attribute _lastM: stores whether or not the "m" was pressed in the last frame
-    #Invariant: _lastM is a bool
+    # Attribute _nextRate: the index of the next unused value in _rates
+    # Invariant: _nextRate is an int 0.._batch
+
+    # Attribute _nextPick: the index of the next unused value in _picks
+    # Invariant: _nextPick is an int 0.._batch
+
+    # Class attribute SOUNDS: the sounds shared by every drawn wave, so that a new
+    # wave reuses them instead of loading them from disk again
+    # Invariant: SOUNDS is a list of Sound and SoundPool objects, or None if no wave
+    # has been drawn yet
+    SOUNDS = None
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
 
@@ -123,29 +170,185 @@ class Wave(object):
     def getLives(self):
         return self._lives
 
+    def getSeed(self):
+        return self._seed
+
+    def getBatch(self):
+        return self._batch
+
+    def getScore(self):
+        return self._score
+
+    def getAliens(self):
+        """
+        A getter for self._aliens (the Formation; do not modify it)
+        """
+        return self._aliens
+
+    def getBolts(self):
+        """
+        A getter for self._bolts (do not modify the list or the bolts)
+        """
+        return self._bolts
+
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW, seed=None, batch=0):
         """
         Initializes the wave
-        """
-        self._aliens = []
-        self._fillAliens()
+
+        Every wave has its own random generator, so waves never affect each
+        other.  Two waves with the same seed (and size) given the same input
+        will play exactly the same game.  If batch is positive, the firing
+        decisions are drawn batch at a time from a NumPy generator instead.
+        This is faster, but gives different games than batch=0 for the same seed.
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+
+        Parameter seed: the random seed, or None to pick one at random
+        Precondition: seed is None or an int >= 0
+
+        Parameter batch: the number of firing decisions to draw at a time
+        Precondition: batch is an int >= 0
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self._seed = seed
+        self._batch = batch
+        if batch > 0:
+            self._random = None
+            self._rng = np.random.default_rng(seed)
+            self._rates = None
+            self._picks = None
+            self._nextRate = batch
+            self._nextPick = batch
+        else:
+            self._random = random.Random(seed)
+            self._rng = None
+            self._rates = None
+            self._picks = None
+            self._nextRate = 0
+            self._nextPick = 0
+
+        self._aliens = Formation(rows, cols)
         self._bolts = []
         self._ship = Ship()
-        self._dline = GPath(points = [0, DEFENSE_LINE, GAME_WIDTH,DEFENSE_LINE], linewidth = 1.1, linecolor = "black")
+        self._dline = None
+        self._drawn = []
         self._lives = 3
         self._time = 0
         self._direction = "right"
-        self._boltSpeed = random.randrange(BOLT_RATE)
+        self._boltSpeed = self._randomRate()
         self._steps = 0
-        self._animator = None
-        self._alienAnimator = None
+        self._shipTime = None
+        self._alienTime = None
         self._index1 = 0
         self._index2 = 0
         self._outcome = None
+        self._score = 0
         self._mute = 0
-        self._sounds = [Sound('pew2.wav'), Sound('blast3.wav'), Sound('blast2.wav'),
-                        Sound('blast1.wav'), Sound('pop1.wav')]
+        self._sounds = None
+
+    # METHODS TO SAVE AND RESTORE THE GAMEPLAY STATE
+    def snapshot(self):
+        """
+        Returns a WaveState with all of the gameplay state of this wave
+
+        The snapshot is immutable (its arrays are read-only copies), so it can
+        be restored any number of times.  It holds no game2d objects, so it can
+        also be pickled and sent to another process.
+        """
+        return WaveState(self._seed, self._batch,
+                         None if self._random is None else self._random.getstate(),
+                         None if self._rng is None else self._rng.bit_generator.state,
+                         self._rates, self._picks, self._nextRate, self._nextPick,
+                         self._aliens.snapshot(),
+                         None if self._ship is None else self._ship.snapshot(),
+                         tuple(bolt.snapshot() for bolt in self._bolts),
+                         self._lives, self._time, self._direction, self._boltSpeed,
+                         self._steps, self._shipTime, self._alienTime, self._index1,
+                         self._index2, self._outcome, self._score, self._mute)
+
+    def restore(self, state):
+        """
+        Sets the gameplay state of this wave from a snapshot
+
+        The defensive line, the sounds and the sprites of the aliens and ship
+        are kept, so a wave on screen can be restored without reloading them.
+
+        Parameter state: the state to restore
+        Precondition: state is a WaveState made by snapshot
+        """
+        self._seed = state.seed
+        self._batch = state.batch
+        if state.random is None:
+            self._random = None
+        else:
+            if self._random is None:
+                self._random = random.Random(0)
+            self._random.setstate(state.random)
+        if state.rng is None:
+            self._rng = None
+        else:
+            if self._rng is None:
+                self._rng = np.random.default_rng(0)
+            self._rng.bit_generator.state = state.rng
+        self._rates = state.rates
+        self._picks = state.picks
+        self._nextRate = state.nextRate
+        self._nextPick = state.nextPick
+
+        if self._aliens is None:
+            self._aliens = Formation(state=state.aliens)
+        else:
+            self._aliens.restore(state.aliens)
+        if state.ship is None:
+            self._ship = None
+        else:
+            if self._ship is None:
+                self._ship = Ship()
+            self._ship.restore(state.ship)
+        self._bolts = []
+        for data in state.bolts:
+            bolt = Bolt(data[0], data[1], data[4])
+            bolt.restore(data)
+            self._bolts.append(bolt)
+
+        self._lives = state.lives
+        self._time = state.time
+        self._direction = state.direction
+        self._boltSpeed = state.boltSpeed
+        self._steps = state.steps
+        self._shipTime = state.shipTime
+        self._alienTime = state.alienTime
+        self._index1 = state.index1
+        self._index2 = state.index2
+        self._outcome = state.outcome
+        self._score = state.score
+        self._mute = state.mute
+        self._applyMute()
+
+    def clone(self):
+        """
+        Returns a new headless wave with the same gameplay state as this one
+
+        The clone shares nothing with this wave, and the two play exactly the
+        same game given the same input.  The clone is never attached to a view
+        (it has no defensive line or sounds until it is drawn).
+        """
+        wave = Wave.__new__(Wave)
+        wave._random = None
+        wave._rng = None
+        wave._aliens = None
+        wave._ship = None
+        wave._dline = None
+        wave._drawn = []
+        wave._sounds = None
+        wave.restore(self.snapshot())
+        return wave
 
     # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
     def update(self, input, dt):
@@ -158,15 +361,21 @@ class Wave(object):
         Parameter input: the given input.
         Precondition: an instance of GInput.
         """
+        #store the positions for interpolation in draw
+        if self._ship != None:
+            self._ship.remember()
+        for bolt in self._bolts:
+            bolt.remember()
+
         #Move and animate ship
-        if self._animator is not None:
+        if self._shipTime is not None:
             self.runShipAnimator(dt)
         else:
             self._ship.moveShip(input)
             self._createPlayerBolt(input)
             self._moveBolt()
 
-        if self._alienAnimator is not None:
+        if self._alienTime is not None:
             self.runAlienAnimator(dt)
 
         self._moveAlienWave(dt)
@@ -178,22 +387,33 @@ class Wave(object):
         self._muteSounds(input)
 
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self, view):
+    def draw(self, view, alpha=1.0):
         """
         Draws the ships aliens, deffensive line and bolts.
 
+        The first call attaches the presentation layer (defensive line and
+        sounds) to this wave.  The ship and bolts are drawn alpha of the way
+        from where they were at the start of the last update to where they are
+        now.  The aliens step, so they are never interpolated.
+
+        If the view is retained, a ship or bolt that is gone since the last call
+        is removed from the view here.
+
         Parameter: The view window
         Precondition: view is a GView.
+
+        Parameter alpha: the interpolation fraction (see GameApp.alpha)
+        Precondition: alpha is a float 0..1
         """
+        if self._dline is None:
+            self._attachView()
+
         #draw aliens
-        for rows in self._aliens:
-            for alien in rows:
-                if alien != None:
-                    alien.draw(view)
+        self._aliens.draw(view)
 
         #draw ships
         if self._ship != None:
-            self._ship.draw(view)
+            self._ship.draw(view, alpha)
 
         #draw defense line
         self._dline.draw(view)
@@ -201,38 +421,32 @@ class Wave(object):
         #draw bolts
         if self._bolts != []:
             for bolt in self._bolts:
-                bolt.draw(view)
+                bolt.draw(view, alpha)
 
-    # HELPER METHODS FOR COLLISION DETECTION
-    def _fillAliens(self):
-        """
-        Helper function for the wave's initializator that fills the self._aliens
-        with a 2d list of aliens
-        """
-        yNext = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT/2)
-        fileNum = 0
-        currentRow = 0
-
-        for x in range(ALIEN_ROWS):
-            xNext = ALIEN_H_SEP + (ALIEN_WIDTH/2)
-
-            #change image every time the current row is divi
-            currentRow = currentRow + 1
-            if fileNum == 3:
-                fileNum = 0
+        #remove the ship and bolts that are gone
+        drawn = list(self._bolts) if self._ship is None else [self._ship]+self._bolts
+        if view.retained:
+            for model in self._drawn:
+                if not model in drawn:
+                    model.erase(view)
+        self._drawn = drawn
 
-            #create variable to store row of aliens
-            row = []
-
-            for x in range(ALIENS_IN_ROW):
-                row.append(Alien(xNext, yNext, fileNum))
-                xNext = xNext + ALIEN_WIDTH + ALIEN_H_SEP
-            yNext = yNext - ALIEN_HEIGHT - ALIEN_V_SEP
+    def erase(self, view):
+        """
+        Removes the ship, aliens, defensive line and bolts from the view.
 
-            self._aliens.append(row)
+        This is only needed when the view is retained (see GView.retained),
+        and the wave is no longer shown.
 
-            if (currentRow % 2) == 0:
-                fileNum = fileNum +1
+        Parameter: The view window
+        Precondition: view is a GView.
+        """
+        self._aliens.erase(view)
+        if self._dline is not None:
+            self._dline.erase(view)
+        for model in self._drawn:
+            model.erase(view)
+        self._drawn = []
 
     #HELPER METHODS TO MOVE THE WAVE OF ALIENS
     def _moveAlienWave(self, dt):
@@ -274,19 +488,13 @@ class Wave(object):
         """
         Helper method that moves the wave of aliens left or right
         """
-        for rows in self._aliens:
-            for alien in rows:
-                if alien != None:
-                    alien.moveAlienAcross(direction)
+        self._aliens.moveAcross(direction)
 
     def _moveWaveDown(self, direction):
         """
         Helper method that moves the wave of aliens down
         """
-        for rows in self._aliens:
-            for alien in rows:
-                if alien != None:
-                    alien.moveAlienDown(direction)
+        self._aliens.moveDown()
 
         #change self._direction after the wave moves down, so the wave can take a
         #ALIEN_H_SEP step away from the edge before switching direction
@@ -299,18 +507,7 @@ class Wave(object):
         """
         Helper method that detects when an alien is at the right or left edge
         """
-        #check each alien in row
-        for rows in self._aliens:
-            for alien in rows:
-                #return true if there is an alien at the right edge
-                if direction == "right":
-                    if alien != None and alien.getX() + (ALIEN_WIDTH/2) >= GAME_WIDTH - ALIEN_H_SEP:
-                        return True
-                #return true if there is an alien at the right edge
-                elif direction == "left":
-                    if alien != None and alien.getX() - (ALIEN_WIDTH/2) < ALIEN_H_SEP:
-                        return True
-        return False
+        return self._aliens.atEdge(direction)
 
     #HELPER METHODS THAT CREATE AND MOVE BOLTS
     def _createPlayerBolt(self, input):
@@ -322,22 +519,18 @@ class Wave(object):
         Parameter input: the given input.
         Precondition: an instance of GInput.
         """
-        currentSpace = input.is_key_down('spacebar')
-
         playerBolts = 0
         for x in self._bolts:
             if x.isPlayerBolt() == True:
                 playerBolts = playerBolts + 1
 
-        #first makes sure there was no Bolt created the frame before
-        if currentSpace == True and self._lastSpace == False:
+        #first makes sure the spacebar was just pressed (not held down)
+        if input.was_key_pressed('spacebar'):
             #then makes sure the player doesnt have a bolt on the screen
             if self._bolts == [] or playerBolts == 0:
                 #creates bolt only if both are true
                 self._bolts.append(Bolt(self._ship.getX(), self._ship.getY() + SHIP_HEIGHT, BOLT_SPEED))
-                self._sounds[0].play()
-
-        self._lastSpace = currentSpace
+                self._playSound(0)
 
     def _moveBolt(self):
         """
@@ -371,47 +564,72 @@ class Wave(object):
 
             #get a list containing the indicies of the nonempty  colomns of aliens
             validColomns = self.validColomns()
+            if validColomns == []:
+                return
 
             #choose a random colomn from that list
-            column = random.choice(validColomns)
+            column = self._randomColumn(validColomns)
 
             #get the bottom most alien of the colomn
             bottom = self.bottomAlien(column)
 
             #create an alien bolt at the given bottom alien
-            self._bolts.append(Bolt(self._aliens[bottom][column].getX(),
-                                    self._aliens[bottom][column].getY() -
+            self._bolts.append(Bolt(self._aliens.getX(bottom, column),
+                                    self._aliens.getY(bottom, column) -
                                     ALIEN_HEIGHT, -BOLT_SPEED))
-            self._boltSpeed = random.randrange(BOLT_RATE)
+            self._boltSpeed = self._randomRate()
             self._steps = 0
 
+    def _randomRate(self):
+        """
+        Returns a random number of steps (0..BOLT_RATE-1) until the aliens fire
+        """
+        if self._batch == 0:
+            return self._random.randrange(BOLT_RATE)
+
+        if self._nextRate == self._batch:
+            self._rates = self._rng.integers(BOLT_RATE, size=self._batch)
+            self._nextRate = 0
+        self._nextRate += 1
+        return int(self._rates[self._nextRate-1])
+
+    def _randomColumn(self, columns):
+        """
+        Returns a random element of the list columns
+
+        Parameter columns: the columns to choose from
+        Precondition: columns is a nonempty list of ints
+        """
+        if self._batch == 0:
+            return self._random.choice(columns)
+
+        if self._nextPick == self._batch:
+            self._picks = self._rng.random(self._batch)
+            self._nextPick = 0
+        self._nextPick += 1
+        return columns[int(self._picks[self._nextPick-1]*len(columns))]
+
     def validColomns(self):
         """
         Returns a list containing the indicies of colomns in self._aliens
         that are not empty
-        """
-        valid = []
-
-        for row in self._aliens:
-            for alien in row:
-                if alien != None and row.index(alien) not in valid:
-                    valid.append(row.index(alien))
 
-        return valid
+        The formation keeps this list up to date as aliens die, so this takes
+        constant time.  The list must not be modified.
+        """
+        return self._aliens.liveColumns()
 
     def bottomAlien(self, column):
         """
         Returns the bottom most alien in the given column of self._aliens
 
+        The formation keeps this row up to date as aliens die, so this takes
+        constant time.
+
         Parameter column: the index of a nonepty column in self._aliens
         Precondition: an int
         """
-        bottom = ALIEN_ROWS - 1
-        for x in range(ALIEN_ROWS):
-            if self._aliens[bottom][column] != None:
-                return bottom
-            else:
-                bottom = bottom -1
+        return self._aliens.bottomRow(column)
 
     #HELPER METHODS TO ANIMATE THE SHIP
     def _destroyShip(self):
@@ -424,26 +642,24 @@ class Wave(object):
         for bolt in self._bolts:
             if self._ship != None and self._ship.collides(bolt) == True:
 
-                #create animator for ship death animation
-                self._animator = self._ship.makeAnimator()
-                next(self._animator)
+                #start the ship death animation
+                self._shipTime = 0
 
                 #remove bolt from list
                 self._bolts.remove(bolt)
-                self._sounds[self._lives].play()
+                self._playSound(self._lives)
                 self._lives = self._lives -1
 
     def runShipAnimator(self, dt):
         """
-        The driver for the ship's animation coroutine
+        The driver for the ship's death animation
 
         Parameter dt: The number of seconds since the last animation frame
         Precondition: dt is an number >= 0
         """
-        try:
-            self._animator.send(dt)
-        except:
-            self._animator = None
+        self._shipTime += dt
+        if not self._ship.explode(self._shipTime):
+            self._shipTime = None
             self._ship = None
             self._bolts = []
 
@@ -454,42 +670,33 @@ class Wave(object):
         start the alien's death animation and remove the player's bot from
         from self._bolts.
         """
-        for row in self._aliens:
-            for alien in row:
-                for bolt in self._bolts:
-                    if alien != None and alien.collides(bolt) == True:
-                        self._index1 = self._aliens.index(row)
-                        self._index2 = row.index(alien)
-                        self._alienAnimator = alien.makeAnimator(alien)
-                        next(self._alienAnimator)
-                        self._sounds[4].play()
+        for bolt, row, col in self._aliens.hits(self._bolts):
+            self._index1 = row
+            self._index2 = col
+            self._alienTime = 0
+            self._playSound(4)
 
-                        self._bolts.remove(bolt)
+            self._bolts.remove(bolt)
 
     def runAlienAnimator(self, dt):
         """
-        The driver for the alien's animation coroutine
+        The driver for the alien's death animation
 
         Parameter dt: The number of seconds since the last animation frame
         Precondition: dt is an number >= 0
         """
-        try:
-            self._alienAnimator.send(dt)
-        except:
-            self._aliens[self._index1][self._index2] = None
-            self._alienAnimator = None
+        self._alienTime += dt
+        if not self._aliens.explode(self._index1, self._index2, self._alienTime):
+            self._aliens.kill(self._index1, self._index2)
+            self._score += ALIEN_POINTS
+            self._alienTime = None
 
     def _walkAliens(self):
         """
         Helper method that creates an alien walking animation by switching all the aliens
         between frames 0 and frame 1.
         """
-        for row in self._aliens:
-            for alien in row:
-                if alien != None and alien.frame == 0:
-                    alien.setFrame(1)
-                elif alien != None and alien.frame == 1:
-                    alien.setFrame(0)
+        self._aliens.walk()
 
     #HELPER METHOD TO BE USED BY APP.PY TO CREATE A SHIP
     def createShip(self):
@@ -502,18 +709,14 @@ class Wave(object):
     def _checkOutcome(self):
         """
         Helper method that determines the game outcome and stores it in self._outcome
+
+        The formation keeps its live count and lowest alien up to date, so this
+        check takes constant time every frame.
         """
-        allDead = True
-        for row in self._aliens:
-            for alien in row:
-                if alien != None:
-                    allDead = False
+        allDead = self._aliens.allDead()
 
-        belowLine = False
-        for row in self._aliens:
-            for alien in row:
-                    if alien != None and alien.getY() - ALIEN_HEIGHT/2 < DEFENSE_LINE:
-                        belowLine = True
+        lowest = self._aliens.lowestY()
+        belowLine = lowest is not None and lowest < DEFENSE_LINE
 
         if allDead == True:
             self._outcome = "win"
@@ -529,19 +732,48 @@ class Wave(object):
         once all sounds are muted. When it is pressed for a second time, the sounds
         are turned back on.
 
+        The mixer is only changed when "m" is pressed, not in every frame.
+
         Parameter input: the given input.
         Precondition: an instance of GInput.
         """
-        currentSound = input.is_key_down('m')
-
-        if currentSound == True and self._lastM == False:
+        if input.was_key_pressed('m'):
             self._mute = self._mute + 1
+            self._applyMute()
 
-        if self._mute % 2 == 0:
-            for x in self._sounds:
-                x.volume = 1
-        elif self._mute%2 == 1:
-            for x in self._sounds:
-                x.volume = 0
+    def _applyMute(self):
+        """
+        Helper method that mutes or unmutes the game mixer to match self._mute.
+        Headless waves (ones that were never drawn) leave the mixer alone.
+        """
+        if self._sounds is not None:
+            from game2d import mixer
+            mixer.muted = self._mute % 2 == 1
+
+    def _playSound(self, index):
+        """
+        Helper method that plays the sound at the given index of self._sounds.
+        Headless waves (ones that were never drawn) have no sounds to play.
+
+        Parameter index: the index of the sound in self._sounds
+        Precondition: index is an int 0..4
+        """
+        if self._sounds is not None:
+            self._sounds[index].play()
 
-        self._lastM = currentSound
+    #HELPER METHOD THAT ATTACHES THE PRESENTATION LAYER
+    def _attachView(self):
+        """
+        Helper method that creates the defensive line and loads the sounds. This is
+        the only place that Wave touches game2d.  The sounds are only loaded by the
+        first wave drawn; later waves share them (see Wave.SOUNDS).
+        """
+        from game2d import GPath, Sound, SoundPool
+
+        self._dline = GPath(points = [0, DEFENSE_LINE, GAME_WIDTH,DEFENSE_LINE], linewidth = 1.1, linecolor = "black")
+        if Wave.SOUNDS is None:
+            Wave.SOUNDS = [SoundPool('pew2.wav', SOUND_VOICES), Sound('blast3.wav'),
+                           Sound('blast2.wav'), Sound('blast1.wav'),
+                           SoundPool('pop1.wav', SOUND_VOICES)]
+        self._sounds = Wave.SOUNDS
+        self._applyMute()
@@ -0,0 +1,470 @@
+"""
+Batched simulation module for Alien Invaders
+
+This module contains a class to play many independent games of Alien Invaders
+at once, for training bots.  It follows the same rules as the class Wave, but
+the state of every game is stored in stacked NumPy arrays, and one call to
+step advances all of the games by one update.  Nothing in this module is ever
+drawn, so it does not need Kivy.
+
+The games differ from Wave in only a few ways, all of which come from having
+no player at the keyboard.  A ship that is destroyed comes back on the next
+update (instead of waiting for the player to press a key), a game that ends is
+immediately reset to a new one, and each game may have at most a fixed number
+of alien bolts on screen at once.  The random choices come from one NumPy
+generator for the whole batch, so a game in a batch will not match a Wave
+with the same seed.
+"""
+from consts import *
+import numpy as np
+
+# The keys of each action, as arrays indexed by action number
+_LEFT  = np.array(['left' in keys for keys in ACTION_KEYS])
+_RIGHT = np.array(['right' in keys for keys in ACTION_KEYS])
+_FIRE  = np.array(['spacebar' in keys for keys in ACTION_KEYS])
+
+# The directions of Wave._direction, as ints
+_DIR_RIGHT = 0
+_DIR_LEFT  = 1
+_DIR_SWITCH_LEFT  = 2
+_DIR_SWITCH_RIGHT = 3
+
+# The distance between the centers of neighboring aliens
+_PITCH_X = ALIEN_WIDTH + ALIEN_H_SEP
+_PITCH_Y = ALIEN_HEIGHT + ALIEN_V_SEP
+
+# The bounds on the ship center (see Ship.moveShip)
+_SHIP_MIN = int(SHIP_WIDTH/2)
+_SHIP_MAX = int(GAME_WIDTH-(SHIP_WIDTH/2))-1
+
+# The number of frames in the ship death animation (see Ship.explode)
+_SHIP_FRAMES = 8
+
+
+class WaveBatch(object):
+    """
+    This class plays a batch of independent waves of Alien Invaders.
+
+    Each game in the batch is controlled by an action number, which is an
+    index into ACTION_KEYS in consts.py.  So action 4 holds down the left arrow
+    and the spacebar.  As in Wave, the spacebar must be released before the
+    ship can fire again.  Every call to step advances each game by dt seconds
+    and returns the observations, rewards and finished games:
+
+        batch = WaveBatch(256, seed=0)
+        obs = batch.observe()
+        while training:
+            obs, reward, done, info = batch.step(policy(obs))
+
+    The reward for a game is the number of points (ALIEN_POINTS per alien)
+    scored in that update.  When a game ends, done is True for that game, the
+    arrays in info hold its final outcome, score and number of updates, and
+    the game is replaced with a new one.  The observations are always for the
+    games that will be played next.
+
+    The observation of a game is a row of observe().  It holds the ship x
+    (as a fraction of GAME_WIDTH), the lives left, the center of the top left
+    alien cell (as fractions of the window), the player bolt (a flag for
+    whether it exists, and its position), the alive flag for every alien
+    (row by row), and then the same three values for each alien bolt slot.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _count: the number of games in the batch
+    # Invariant: _count is an int > 0
+    #
+    # Attribute _rows: the number of rows of aliens in each game
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cols: the number of aliens in each row
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _dt: the number of seconds in a single update
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _rng: the random generator for all of the games
+    # Invariant: _rng is a numpy Generator
+    #
+    # Attribute _shipX: the ship x in each game
+    # Invariant: _shipX is a (_count,) float array
+    #
+    # Attribute _shipUp: whether each game has a ship on screen (dying or not)
+    # Invariant: _shipUp is a (_count,) bool array
+    #
+    # Attribute _shipTime: the time spent in the ship death animation
+    # Invariant: _shipTime is a (_count,) float array, -1 if the ship is not dying
+    #
+    # Attribute _lives: the number of lives left in each game
+    # Invariant: _lives is a (_count,) int array >= 0
+    #
+    # Attribute _lastFire: whether the spacebar was down in the last update
+    # Invariant: _lastFire is a (_count,) bool array
+    #
+    # Attribute _alienX: the x of the top left alien cell in each game
+    # Invariant: _alienX is a (_count,) float array
+    #
+    # Attribute _alienY: the y of the top left alien cell in each game
+    # Invariant: _alienY is a (_count,) float array
+    #
+    # Attribute _alive: the alive flag of every alien in each game
+    # Invariant: _alive is a (_count, _rows, _cols) bool array
+    #
+    # Attribute _direction: the march direction of each game (a _DIR constant)
+    # Invariant: _direction is a (_count,) int array
+    #
+    # Attribute _time: the time since the last alien step in each game
+    # Invariant: _time is a (_count,) float array >= 0
+    #
+    # Attribute _steps: the number of alien steps since the aliens last fired
+    # Invariant: _steps is a (_count,) int array >= 0
+    #
+    # Attribute _boltSpeed: the number of steps until the aliens fire
+    # Invariant: _boltSpeed is a (_count,) int array in 0..BOLT_RATE-1
+    #
+    # Attribute _dying: the (flattened) cell of the alien being destroyed
+    # Invariant: _dying is a (_count,) int array, -1 if no alien is dying
+    #
+    # Attribute _dyingTime: the time spent in the alien death animation
+    # Invariant: _dyingTime is a (_count,) float array >= 0
+    #
+    # Attribute _playerBolt: whether each game has a player bolt on screen
+    # Invariant: _playerBolt is a (_count,) bool array
+    #
+    # Attribute _playerX, _playerY: the position of the player bolt
+    # Invariant: _playerX, _playerY are (_count,) float arrays
+    #
+    # Attribute _alienBolt: whether each alien bolt slot is in use
+    # Invariant: _alienBolt is a (_count, capacity) bool array
+    #
+    # Attribute _boltX, _boltY: the position of each alien bolt
+    # Invariant: _boltX, _boltY are (_count, capacity) float arrays
+    #
+    # Attribute _outcome: the outcome of each game (an OUTCOME constant)
+    # Invariant: _outcome is a (_count,) int array
+    #
+    # Attribute _score: the points scored in each game
+    # Invariant: _score is a (_count,) int array >= 0
+    #
+    # Attribute _ticks: the number of updates played in each game
+    # Invariant: _ticks is a (_count,) int array >= 0
+
+    # GETTERS AND SETTERS
+    def getCount(self):
+        return self._count
+
+    def getLives(self):
+        return self._lives.copy()
+
+    def getScores(self):
+        return self._score.copy()
+
+    # INITIALIZER
+    def __init__(self, count, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW, seed=None,
+                 dt=1.0/TICK_RATE, capacity=16):
+        """
+        Initializes a batch of count new games
+
+        Parameter count: the number of games
+        Precondition: count is an int > 0
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+
+        Parameter seed: the random seed, or None to pick one at random
+        Precondition: seed is None or an int >= 0
+
+        Parameter dt: the number of seconds in a single update
+        Precondition: dt is a float > 0
+
+        Parameter capacity: the most alien bolts a game may have at once
+        Precondition: capacity is an int > 0
+        """
+        self._count = count
+        self._rows = rows
+        self._cols = cols
+        self._dt = dt
+        self._rng = np.random.default_rng(seed)
+
+        self._shipX = np.zeros(count)
+        self._shipUp = np.zeros(count, dtype=bool)
+        self._shipTime = np.zeros(count)
+        self._lives = np.zeros(count, dtype=int)
+        self._lastFire = np.zeros(count, dtype=bool)
+
+        self._alienX = np.zeros(count)
+        self._alienY = np.zeros(count)
+        self._alive = np.zeros((count, rows, cols), dtype=bool)
+        self._direction = np.zeros(count, dtype=int)
+        self._time = np.zeros(count)
+        self._steps = np.zeros(count, dtype=int)
+        self._boltSpeed = np.zeros(count, dtype=int)
+        self._dying = np.zeros(count, dtype=int)
+        self._dyingTime = np.zeros(count)
+
+        self._playerBolt = np.zeros(count, dtype=bool)
+        self._playerX = np.zeros(count)
+        self._playerY = np.zeros(count)
+        self._alienBolt = np.zeros((count, capacity), dtype=bool)
+        self._boltX = np.zeros((count, capacity))
+        self._boltY = np.zeros((count, capacity))
+
+        self._outcome = np.zeros(count, dtype=int)
+        self._score = np.zeros(count, dtype=int)
+        self._ticks = np.zeros(count, dtype=int)
+
+        self.reset()
+
+    # PUBLIC METHODS
+    def reset(self, mask=None):
+        """
+        Replaces the given games with new ones
+
+        Parameter mask: the games to reset, or None to reset all of them
+        Precondition: mask is None or a (count,) bool array
+        """
+        if mask is None:
+            mask = np.ones(self._count, dtype=bool)
+
+        self._shipX[mask] = GAME_WIDTH/2
+        self._shipUp[mask] = True
+        self._shipTime[mask] = -1
+        self._lives[mask] = SHIP_LIVES
+        self._lastFire[mask] = False
+
+        self._alienX[mask] = ALIEN_H_SEP + (ALIEN_WIDTH/2)
+        self._alienY[mask] = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT/2)
+        self._alive[mask] = True
+        self._direction[mask] = _DIR_RIGHT
+        self._time[mask] = 0
+        self._steps[mask] = 0
+        self._boltSpeed[mask] = self._rng.integers(BOLT_RATE, size=int(mask.sum()))
+        self._dying[mask] = -1
+        self._dyingTime[mask] = 0
+
+        self._playerBolt[mask] = False
+        self._alienBolt[mask] = False
+
+        self._outcome[mask] = OUTCOME_NONE
+        self._score[mask] = 0
+        self._ticks[mask] = 0
+
+    def step(self, actions):
+        """
+        Returns (observations, rewards, done, info) after one update of every game
+
+        The games that end in this update are reset, and info is a dictionary
+        with the arrays 'outcome', 'score' and 'ticks' holding the final values
+        for those games.
+
+        Parameter actions: the action number of each game
+        Precondition: actions is a sequence of count ints, indices of ACTION_KEYS
+        """
+        actions = np.asarray(actions)
+        score = self._score.copy()
+
+        self._stepShip(_LEFT[actions], _RIGHT[actions], _FIRE[actions])
+        self._stepDyingAlien()
+        self._marchAliens()
+        self._fireAlienBolts()
+        self._destroyAliens()
+        self._destroyShips()
+        self._checkOutcomes()
+
+        #a destroyed ship comes back at once (there is no player to unpause)
+        respawn = ~self._shipUp & (self._lives > 0) & (self._outcome == OUTCOME_NONE)
+        self._shipUp[respawn] = True
+        self._shipX[respawn] = GAME_WIDTH/2
+
+        self._ticks += 1
+        reward = self._score - score
+        done = self._outcome != OUTCOME_NONE
+        info = {'outcome': self._outcome.copy(), 'score': self._score.copy(),
+                'ticks': self._ticks.copy()}
+        if done.any():
+            self.reset(done)
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        """
+        Returns the observations of every game as a (count, features) float32 array
+        """
+        bolts = np.stack([self._alienBolt, self._boltX/GAME_WIDTH,
+                          self._boltY/GAME_HEIGHT], axis=2)
+        return np.concatenate([
+            (self._shipX/GAME_WIDTH)[:, None], self._lives[:, None],
+            (self._alienX/GAME_WIDTH)[:, None], (self._alienY/GAME_HEIGHT)[:, None],
+            self._playerBolt[:, None], (self._playerX/GAME_WIDTH)[:, None],
+            (self._playerY/GAME_HEIGHT)[:, None],
+            self._alive.reshape(self._count, -1),
+            bolts.reshape(self._count, -1)], axis=1).astype(np.float32)
+
+    # HELPER METHODS (ONE FOR EACH STEP OF Wave.update)
+    def _stepShip(self, left, right, fire):
+        """
+        Moves the ships and bolts, or animates the ships that are dying
+
+        As in Wave, nothing moves in a game whose ship is dying.
+
+        Parameter left, right, fire: the keys held down in each game
+        Precondition: left, right, fire are (count,) bool arrays
+        """
+        dying = self._shipTime >= 0
+        self._shipTime[dying] += self._dt
+        frame = np.rint(self._shipTime/DEATH_SPEED*7 + 1)
+        ended = dying & ((frame >= _SHIP_FRAMES) | (self._shipTime >= DEATH_SPEED))
+        self._shipTime[ended] = -1
+        self._shipUp[ended] = False
+        self._playerBolt[ended] = False
+        self._alienBolt[ended] = False
+
+        active = self._shipUp & ~dying
+        move = (right.astype(int) - left.astype(int))*SHIP_MOVEMENT
+        self._shipX = np.where(active, np.clip(self._shipX + move, _SHIP_MIN, _SHIP_MAX),
+                               self._shipX)
+
+        shoot = active & fire & ~self._lastFire & ~self._playerBolt
+        self._playerBolt |= shoot
+        self._playerX[shoot] = self._shipX[shoot]
+        self._playerY[shoot] = SHIP_BOTTOM + SHIP_HEIGHT
+        self._lastFire = fire.copy()
+
+        self._playerY[active] += BOLT_SPEED
+        self._boltY[active] -= BOLT_SPEED
+        self._playerBolt &= ~(self._playerY - BOLT_HEIGHT/2 > GAME_HEIGHT)
+        self._alienBolt &= ~(self._boltY + BOLT_HEIGHT/2 < 0)
+
+    def _stepDyingAlien(self):
+        """
+        Animates the dying aliens, removing the ones whose animation is over
+        """
+        dying = self._dying >= 0
+        self._dyingTime[dying] += self._dt
+        ended = np.flatnonzero(dying & (self._dyingTime >= DEATH_SPEED))
+        self._alive.reshape(self._count, -1)[ended, self._dying[ended]] = False
+        self._score[ended] += ALIEN_POINTS
+        self._dying[ended] = -1
+
+    def _marchAliens(self):
+        """
+        Moves the aliens in every game whose step time is up
+        """
+        waiting = self._time <= ALIEN_SPEED
+        self._time[waiting] += self._dt
+        march = self._time > ALIEN_SPEED
+        self._steps[march] += 1
+        self._time[march] = 0
+
+        direction = self._direction
+        switch = march & (direction >= _DIR_SWITCH_LEFT)
+        self._alienX[switch] += np.where(direction[switch] == _DIR_SWITCH_LEFT,
+                                         -(ALIEN_WIDTH/2), ALIEN_WIDTH/2)
+
+        #the live columns bound the formation
+        cols = self._alive.any(axis=1)
+        anyLive = cols.any(axis=1)
+        first = np.argmax(cols, axis=1)
+        last = self._cols - 1 - np.argmax(cols[:, ::-1], axis=1)
+        atRight = anyLive & (self._alienX + last*_PITCH_X + (ALIEN_WIDTH/2) >= GAME_WIDTH - ALIEN_H_SEP)
+        atLeft = anyLive & (self._alienX + first*_PITCH_X - (ALIEN_WIDTH/2) < ALIEN_H_SEP)
+        edge = march & ~switch & np.where(direction == _DIR_RIGHT, atRight, atLeft)
+        self._alienY[edge] -= ALIEN_V_WALK
+
+        across = march & ~switch & ~edge
+        self._alienX[across] += np.where(direction[across] == _DIR_RIGHT,
+                                         ALIEN_H_WALK, -ALIEN_H_WALK)
+
+        self._direction = np.select(
+            [switch & (direction == _DIR_SWITCH_LEFT), switch,
+             edge & (direction == _DIR_RIGHT), edge],
+            [_DIR_LEFT, _DIR_RIGHT, _DIR_SWITCH_LEFT, _DIR_SWITCH_RIGHT], direction)
+
+    def _fireAlienBolts(self):
+        """
+        Fires a bolt from a random column in every game whose aliens are due to fire
+        """
+        cols = self._alive.any(axis=1)
+        live = cols.sum(axis=1)
+        games = np.flatnonzero((self._steps > self._boltSpeed) & (live > 0))
+        if len(games) == 0:
+            return
+
+        #pick a random live column, then the bottom alien in that column
+        pick = (self._rng.random(len(games))*live[games]).astype(int)
+        col = np.argmax(np.cumsum(cols[games], axis=1) > pick[:, None], axis=1)
+        column = self._alive[games, :, col]
+        row = self._rows - 1 - np.argmax(column[:, ::-1], axis=1)
+
+        #use the first free slot (the bolt is lost if there is none)
+        free = ~self._alienBolt[games]
+        slot = np.argmax(free, axis=1)
+        room = free.any(axis=1)
+        self._alienBolt[games[room], slot[room]] = True
+        self._boltX[games[room], slot[room]] = (self._alienX[games] + col*_PITCH_X)[room]
+        self._boltY[games[room], slot[room]] = (self._alienY[games] - row*_PITCH_Y - ALIEN_HEIGHT)[room]
+
+        self._boltSpeed[games] = self._rng.integers(BOLT_RATE, size=len(games))
+        self._steps[games] = 0
+
+    def _destroyAliens(self):
+        """
+        Starts the death animation of every alien hit by a player bolt
+
+        This uses the same test as Formation.hits.
+        """
+        games = np.flatnonzero(self._playerBolt)
+        if len(games) == 0:
+            return
+
+        px = self._playerX[games, None] + np.array([-1, 1, 1, -1])*(BOLT_WIDTH/2)
+        py = self._playerY[games, None] + np.array([1, 1, -1, -1])*(BOLT_HEIGHT/2)
+        x0 = self._alienX[games, None]
+        y0 = self._alienY[games, None]
+
+        col = np.rint((px - x0)/_PITCH_X).astype(int)
+        row = np.rint((y0 - py)/_PITCH_Y).astype(int)
+        inside = (row >= 0) & (row < self._rows) & (col >= 0) & (col < self._cols)
+        row = np.where(inside, row, 0)
+        col = np.where(inside, col, 0)
+        inside &= self._alive[games[:, None], row, col]
+        inside &= np.abs(px - (x0 + col*_PITCH_X)) < ALIEN_WIDTH/2.0
+        inside &= np.abs(py - (y0 - row*_PITCH_Y)) < ALIEN_HEIGHT/2.0
+
+        cells = self._rows*self._cols
+        cell = np.where(inside, row*self._cols + col, cells).min(axis=1)
+        hit = cell < cells
+        self._dying[games[hit]] = cell[hit]
+        self._dyingTime[games[hit]] = 0
+        self._playerBolt[games[hit]] = False
+
+    def _destroyShips(self):
+        """
+        Starts the death animation of every ship hit by alien bolts
+
+        As in Wave, each bolt that hits the ship costs a life.
+        """
+        dx = np.abs(self._boltX - self._shipX[:, None])
+        dy = np.abs(self._boltY - SHIP_BOTTOM)
+        inX = (np.abs(dx - BOLT_WIDTH/2) < SHIP_WIDTH/2.0) | (np.abs(dx + BOLT_WIDTH/2) < SHIP_WIDTH/2.0)
+        inY = (np.abs(dy - BOLT_HEIGHT/2) < SHIP_HEIGHT/2.0) | (np.abs(dy + BOLT_HEIGHT/2) < SHIP_HEIGHT/2.0)
+        hits = self._alienBolt & inX & inY & self._shipUp[:, None]
+
+        count = hits.sum(axis=1)
+        struck = count > 0
+        self._shipTime[struck] = 0
+        self._lives = np.maximum(self._lives - count, 0)
+        self._alienBolt &= ~hits
+
+    def _checkOutcomes(self):
+        """
+        Determines the outcome of every game, as in Wave._checkOutcome
+        """
+        rows = self._alive.any(axis=2)
+        anyLive = rows.any(axis=1)
+        last = self._rows - 1 - np.argmax(rows[:, ::-1], axis=1)
+        lowest = self._alienY - last*_PITCH_Y - ALIEN_HEIGHT/2
+
+        lose = (anyLive & (lowest < DEFENSE_LINE)) | (self._lives == 0)
+        self._outcome = np.where(~anyLive, OUTCOME_WIN,
+                                 np.where(lose, OUTCOME_LOSE, OUTCOME_NONE))